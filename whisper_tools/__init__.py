@@ -4,21 +4,14 @@ Whisper Tools - 音频和视频转写工具集
 这个包提供了基于 OpenAI Whisper 模型的转写功能：
 - transcribe_file: 单文件转写功能
 - transcribe_batch: 批量文件转写功能
+
+主要功能按需导入（PEP 562），只使用 dual_text 等轻量脚本时
+不会加载 Whisper 模型及其依赖。
 """
 
 __version__ = "1.0.0"
 __author__ = "Whisper Tools Team"
 
-# 导入主要功能
-from .transcribe_file import (
-    transcribe_file,
-    save_as_txt,
-    save_as_srt,
-    save_as_json,
-    is_audio,
-    is_video
-)
-
 # 定义公开的 API
 __all__ = [
     "transcribe_file",
@@ -27,4 +20,34 @@ __all__ = [
     "save_as_json",
     "is_audio",
     "is_video"
-]
\ No newline at end of file
+]
+
+import sys as _sys
+import types as _types
+
+def __getattr__(name):
+    if name in __all__:
+        from importlib import import_module
+        module = import_module(".transcribe_file", __name__)
+        globals().update({export: getattr(module, export) for export in __all__})
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class _Package(_types.ModuleType):
+    """
+    子模块 transcribe_file 与导出的同名函数共用一个包属性名。
+
+    任何地方导入子模块（包括 transcribe_batch 的相对导入）时，导入系统都会把
+    包属性 transcribe_file 绑定为模块本身；这里拦截该绑定，改为绑定同名函数，
+    使 whisper_tools.transcribe_file 始终是函数，与直接导入时的行为一致。
+    """
+
+    def __setattr__(self, name, value):
+        if name == "transcribe_file" and isinstance(value, _types.ModuleType):
+            value = value.transcribe_file
+        super().__setattr__(name, value)
+
+_sys.modules[__name__].__class__ = _Package
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,61 @@
+# _trans_cache.py
+"""
+翻译结果的持久化缓存（diskcache，底层为 SQLite）。
+
+进程内的 LRU 在退出后即失效；字幕反复修改、重新翻译时，
+未改动的字幕可以直接从磁盘缓存取回，不再消耗接口请求与配额。
+未安装 diskcache 时所有操作均为空操作。
+"""
+import atexit
+import hashlib
+import os
+from functools import lru_cache
+
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "whisper_translate")
+CACHE_TTL = 30 * 24 * 3600            # 缓存条目保留 30 天
+CACHE_SIZE_LIMIT = 256 * 1024 * 1024  # 超过 256MB 时按使用频率淘汰
+
+_read_enabled = True
+
+@lru_cache(maxsize=1)
+def _get_cache():
+    """首次使用时打开缓存目录；未安装 diskcache 时返回 None"""
+    if not HAS_DISKCACHE:
+        return None
+    cache = diskcache.Cache(
+        CACHE_DIR,
+        size_limit=CACHE_SIZE_LIMIT,
+        eviction_policy="least-frequently-used"
+    )
+    atexit.register(cache.close)
+    return cache
+
+def cache_key(text, source_lang, target_lang):
+    """缓存键：sha1(源语言|目标语言|原文)"""
+    return hashlib.sha1(f"{source_lang}|{target_lang}|{text}".encode("utf-8")).hexdigest()
+
+def get(text, source_lang, target_lang):
+    """读取缓存的译文，未命中或已禁用读取时返回 None"""
+    if not _read_enabled:
+        return None
+    cache = _get_cache()
+    if cache is None:
+        return None
+    return cache.get(cache_key(text, source_lang, target_lang))
+
+def put(text, source_lang, target_lang, result):
+    """写入译文，CACHE_TTL 秒后过期"""
+    cache = _get_cache()
+    if cache is not None:
+        cache.set(cache_key(text, source_lang, target_lang), result, expire=CACHE_TTL)
+
+def set_read_enabled(enabled):
+    """关闭读取后所有文本都会重新翻译，新译文仍写入缓存（用于强制刷新）"""
+    global _read_enabled
+    _read_enabled = enabled
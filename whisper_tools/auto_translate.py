@@ -1,28 +1,30 @@
 # scripts/auto_translate.py
 import argparse
-import srt
-import datetime
 from transcriber import transcribe_file
-from translator import translate_text
-from srt_utils import save_srt
+from translator import translate_texts
 
-def segments_to_srt(segments):
-    subtitles = []
-    for i, seg in enumerate(segments):
-        start = datetime.timedelta(seconds=seg['start'])
-        end = datetime.timedelta(seconds=seg['end'])
-        subtitles.append(srt.Subtitle(index=i+1, start=start, end=end, content=seg['text']))
-    return subtitles
+def _fmt(ms):
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+def write_srt(segments, fh):
+    for i, seg in enumerate(segments, 1):
+        start_ms = int(round(seg['start'] * 1000))
+        end_ms = int(round(seg['end'] * 1000))
+        fh.write(f"{i}\n{_fmt(start_ms)} --> {_fmt(end_ms)}\n{seg['text']}\n\n")
 
 def auto_translate(file_path, target_lang="zh"):
     text, segments = transcribe_file(file_path)
-    srt_entries = segments_to_srt(segments)
-    translated = [translate_text(entry.content, "en", target_lang) for entry in srt_entries]
-    for i, entry in enumerate(srt_entries):
-        entry.content = translated[i]
+    # 重复的句子（"Thank you."、"[Music]" 等）只翻译一次
+    texts = [seg['text'] for seg in segments]
+    unique = list(dict.fromkeys(texts))
+    cache = dict(zip(unique, translate_texts(unique, "en", target_lang)))
+    translated = [cache[t] for t in texts]
     output_path = f"output/{file_path.split('/')[-1].split('.')[0]}_{target_lang}.srt"
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(srt.compose(srt_entries))
+        write_srt(({**seg, 'text': t} for seg, t in zip(segments, translated)), f)
     print(f"✅ 翻译完成，已保存至：{output_path}")
 
 if __name__ == "__main__":
@@ -2,17 +2,15 @@
 import argparse
 
 def merge_texts(en_file, zh_file, output_file):
-    with open(en_file, "r", encoding="utf-8") as f1:
-        en_lines = f1.readlines()
-    with open(zh_file, "r", encoding="utf-8") as f2:
-        zh_lines = f2.readlines()
+    # 逐行流式合并，不整体读入内存；按文本解码后再 strip，
+    # 中文译文首尾的全角空格（U+3000）、不换行空格等 Unicode 空白也会被去掉
+    with open(en_file, "r", encoding="utf-8") as f1, open(zh_file, "r", encoding="utf-8") as f2, \
+            open(output_file, "w", encoding="utf-8", buffering=1 << 20) as out:
+        for i, (en, zh) in enumerate(zip(f1, f2)):
+            if i:
+                out.write("\n")
+            out.write(f"{en.strip()} || {zh.strip()}")
 
-    merged = []
-    for en, zh in zip(en_lines, zh_lines):
-        merged.append(f"{en.strip()} || {zh.strip()}")
-
-    with open(output_file, "w", encoding="utf-8") as out:
-        out.write("\n".join(merged))
     print(f"✅ 中英对照文件已保存：{output_file}")
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+"""whisper_tools 包级导出的测试：每个用例在独立的解释器中运行，避免受已导入模块影响"""
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class PackageExportTest(unittest.TestCase):
+
+    def _run(self, code):
+        result = subprocess.run(
+            [sys.executable, "-c", textwrap.dedent(code)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+    def test_import_is_lazy(self):
+        self._run("""
+            import sys
+            import whisper_tools
+            assert "whisper_tools.transcribe_file" not in sys.modules
+        """)
+
+    def test_export_is_function(self):
+        self._run("""
+            import types
+            import whisper_tools
+            assert isinstance(whisper_tools.transcribe_file, types.FunctionType)
+        """)
+
+    def test_export_after_submodule_import(self):
+        # transcribe_batch 会导入子模块 transcribe_file，包属性不能因此变成模块
+        self._run("""
+            import types
+            import whisper_tools.transcribe_batch
+            import whisper_tools
+            assert isinstance(whisper_tools.transcribe_file, types.FunctionType)
+            assert isinstance(whisper_tools.save_as_srt, types.FunctionType)
+        """)
+
+    def test_export_after_direct_submodule_import(self):
+        self._run("""
+            import types
+            import whisper_tools.transcribe_file
+            import whisper_tools
+            from whisper_tools.transcribe_file import save_as_txt
+            assert isinstance(whisper_tools.transcribe_file, types.FunctionType)
+            assert save_as_txt is whisper_tools.save_as_txt
+        """)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""transcribe_file 命令行、模块导入与输出格式的测试（不需要 Whisper 模型）"""
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from whisper_tools.transcribe_file import SAMPLE_RATE, _format_timestamp, _read_wav_pcm16
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = PACKAGE_DIR.parent
+
+
+class ProcessDirectoryCliTest(unittest.TestCase):
+    """--input-dir --batch-size 需要导入 transcribe_batch，两种运行方式都要能找到它"""
+
+    def _run_cli(self, command, cwd):
+        with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+            result = subprocess.run(
+                command + ["--input-dir", input_dir, "--output-dir", output_dir, "--batch-size", "4"],
+                cwd=cwd, capture_output=True, text=True, timeout=120
+            )
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn("0/0", result.stdout)
+
+    def test_batch_size_as_script(self):
+        self._run_cli([sys.executable, str(PACKAGE_DIR / "transcribe_file.py")], cwd=PROJECT_ROOT)
+
+    def test_batch_size_as_module(self):
+        self._run_cli([sys.executable, "-m", "whisper_tools.transcribe_file"], cwd=PROJECT_ROOT)
+
+
+class FormatTimestampTest(unittest.TestCase):
+    """秒数按四舍五入换算为毫秒，浮点乘积略小于整数时不能少 1 毫秒"""
+
+    def test_rounds_float_product(self):
+        self.assertEqual(_format_timestamp(2.01), "00:00:02,010")
+        self.assertEqual(_format_timestamp(4.06), "00:00:04,060")
+
+    def test_every_centisecond_is_exact(self):
+        for centis in range(0, 100000, 7):
+            seconds = centis / 100
+            self.assertEqual(_format_timestamp(seconds)[-3:], f"{centis % 100 * 10:03d}", seconds)
+
+    def test_hours_and_minutes(self):
+        self.assertEqual(_format_timestamp(3723.5), "01:02:03,500")
+        self.assertEqual(_format_timestamp(0), "00:00:00,000")
+
+
+def _chunk(chunk_id, body):
+    """RIFF 子块：奇数长度的子块后补一个填充字节"""
+    return chunk_id + struct.pack("<I", len(body)) + body + (b"\0" if len(body) & 1 else b"")
+
+
+def _wav(samples, sample_rate=SAMPLE_RATE, channels=1, extra_chunks=()):
+    fmt = struct.pack("<HHIIHH", 1, channels, sample_rate, sample_rate * 2 * channels, 2 * channels, 16)
+    body = b"WAVE" + _chunk(b"fmt ", fmt) + b"".join(extra_chunks)
+    body += _chunk(b"data", np.asarray(samples, dtype="<i2").tobytes())
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+class ReadWavTest(unittest.TestCase):
+    def _read(self, data):
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            f.write(data)
+        self.addCleanup(os.unlink, f.name)
+        return _read_wav_pcm16(f.name, SAMPLE_RATE)
+
+    def test_reads_pcm16_mono(self):
+        audio = self._read(_wav([0, 16384, -32768]))
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_array_equal(audio, [0.0, 0.5, -1.0])
+
+    def test_skips_extra_chunks_with_padding(self):
+        """fmt 与 data 之间的 LIST / 奇数长度子块被跳过（含填充字节）"""
+        extra = (_chunk(b"LIST", b"INFOISFT\x05\0\0\0Lavf\0"), _chunk(b"junk", b"abc"))
+        audio = self._read(_wav([1, 2, 3, 4], extra_chunks=extra))
+        np.testing.assert_array_equal(audio * 32768, [1, 2, 3, 4])
+
+    def test_other_formats_fall_back(self):
+        """采样率、声道不符合或不是 WAV 时返回 None，交给 ffmpeg 解码"""
+        self.assertIsNone(self._read(_wav([0, 0], sample_rate=44100)))
+        self.assertIsNone(self._read(_wav([0, 0], channels=2)))
+        self.assertIsNone(self._read(b"ID3\x03" + b"\0" * 32))
+        self.assertIsNone(self._read(b"RIFF"))
+
+
+if __name__ == "__main__":
+    unittest.main()
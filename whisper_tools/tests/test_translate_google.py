@@ -0,0 +1,97 @@
+"""translate_google 的缓存、长文本切分 / 拼接与译文调整测试（不发出翻译请求）"""
+import importlib
+import tempfile
+import unittest
+from unittest import mock
+
+tg = importlib.import_module("whisper_tools.translate_google")
+_trans_cache = importlib.import_module("whisper_tools._trans_cache")
+
+
+class CacheStatsTest(unittest.TestCase):
+    """磁盘缓存指向临时目录，每个用例从空的进程内缓存与计数开始"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(_trans_cache, "CACHE_DIR", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        _trans_cache._get_cache.cache_clear()
+        self.addCleanup(_trans_cache._get_cache.cache_clear)
+        tg._translation_cache.clear()
+        tg._normalized_cache.clear()
+        self.addCleanup(tg._translation_cache.clear)
+        self.addCleanup(tg._normalized_cache.clear)
+        stats = mock.patch.dict(tg.cache_stats, {"hits": 0, "normalized_hits": 0, "misses": 0})
+        stats.start()
+        self.addCleanup(stats.stop)
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(tg._lookup("Hello there.", "en", "zh"))
+        tg._cache_put("Hello there.", "en", "zh", "你好。")
+        self.assertEqual(tg._lookup("Hello there.", "en", "zh"), "你好。")
+        self.assertEqual(tg.cache_stats, {"hits": 1, "normalized_hits": 0, "misses": 1})
+
+    def test_normalized_hit(self):
+        tg._cache_put("Hello there.", "en", "zh", "你好。")
+        self.assertEqual(tg._lookup("hello there!", "en", "zh"), "你好！")
+        self.assertEqual(tg.cache_stats, {"hits": 0, "normalized_hits": 1, "misses": 0})
+
+    def test_passthrough_is_not_counted(self):
+        """只含符号的文本与同语言翻译原样返回，不计入命中或未命中"""
+        self.assertEqual(tg._lookup("♪ ... ♪", "en", "zh"), "♪ ... ♪")
+        self.assertEqual(tg._lookup("<i>--</i>", "en", "zh"), "<i>--</i>")
+        self.assertEqual(tg._lookup("Hello.", "zh", "zh"), "Hello.")
+        self.assertEqual(tg.cache_stats, {"hits": 0, "normalized_hits": 0, "misses": 0})
+
+    def test_disk_read_can_be_disabled(self):
+        tg._cache_put("Good night.", "en", "zh", "晚安。")
+        tg._translation_cache.clear()
+        tg._normalized_cache.clear()
+        tg.set_cache_read_enabled(False)
+        self.addCleanup(tg.set_cache_read_enabled, True)
+        self.assertIsNone(tg._lookup("Good night.", "en", "zh"))
+        tg.set_cache_read_enabled(True)
+        self.assertEqual(tg._lookup("Good night.", "en", "zh"), "晚安。")
+
+
+class SplitJoinTest(unittest.TestCase):
+    def test_short_texts_are_not_split(self):
+        pieces, counts = tg._split_long_texts(["a b", "c"], max_chars=10)
+        self.assertEqual((pieces, counts), (["a b", "c"], [1, 1]))
+
+    def test_split_at_sentences_within_limit(self):
+        text = "First sentence here. Second one is here. Third."
+        pieces, counts = tg._split_long_texts([text], max_chars=25)
+        self.assertEqual(counts, [len(pieces)])
+        self.assertTrue(all(len(piece) <= 25 for piece in pieces))
+        self.assertEqual(tg._join_pieces(pieces, counts, "en"), [text])
+
+    def test_hard_split_prefers_whitespace(self):
+        self.assertEqual(list(tg._hard_split("aaaa bbbb cccc", 10)), ["aaaa bbbb", "cccc"])
+        self.assertEqual(list(tg._hard_split("abcdefghijkl", 5)), ["abcde", "fghij", "kl"])
+
+    def test_no_space_language_round_trip(self):
+        """中文等目标语言按段数拼回时不插入空格；带地区后缀的语言代码同样适用"""
+        text = "One. Two. Three."
+        pieces, counts = tg._split_long_texts([text, "Four."], max_chars=6)
+        self.assertEqual(pieces, ["One.", "Two.", "Three.", "Four."])
+        translated = ["一。", "二。", "三。", "四。"]
+        for lang in ("zh", "zh-TW", "ja"):
+            self.assertEqual(tg._join_pieces(translated, counts, lang), ["一。二。三。", "四。"])
+        self.assertEqual(tg._join_pieces(translated, counts, "fr"), ["一。 二。 三。", "四。"])
+
+
+class AdaptTranslationTest(unittest.TestCase):
+    def test_keeps_fullwidth_form_for_cjk(self):
+        self.assertEqual(tg._adapt_translation("Hello!", "你好。"), "你好！")
+        self.assertEqual(tg._adapt_translation("Hello?", "你好"), "你好？")
+
+    def test_ascii_target_and_capitalization(self):
+        self.assertEqual(tg._adapt_translation("Hello?", "bonjour !"), "Bonjour?")
+        self.assertEqual(tg._adapt_translation("hello", "Hallo."), "Hallo")
+
+
+if __name__ == "__main__":
+    unittest.main()
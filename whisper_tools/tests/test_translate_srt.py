@@ -0,0 +1,50 @@
+"""translate_srt 的字幕读写测试（不发出翻译请求）"""
+import importlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+# translate_srt 按脚本方式 `from translator import ...` 导入翻译模块，测试中指向本包的 translate_google
+sys.modules.setdefault("translator", importlib.import_module("whisper_tools.translate_google"))
+
+from whisper_tools.translate_srt import Cue, iter_srt, write_srt_batch
+
+SRT = (
+    "1\n00:00:01,000 --> 00:00:02,000\nHello.\n\n"
+    "2\n00:00:02,000 --> 00:00:03,000\n\n"
+    "3\n00:00:03,000 --> 00:00:04,500\nTwo\nlines\n\n"
+)
+
+
+class SrtRoundTripTest(unittest.TestCase):
+    def _read(self, text):
+        with tempfile.NamedTemporaryFile("w", suffix=".srt", encoding="utf-8", delete=False) as f:
+            f.write(text)
+        self.addCleanup(os.unlink, f.name)
+        return list(iter_srt(f.name))
+
+    def test_parse_cues(self):
+        cues = self._read(SRT)
+        self.assertEqual(cues[0], Cue("1", "00:00:01,000 --> 00:00:02,000", "Hello."))
+        self.assertEqual(cues[1].content, "")
+        self.assertEqual(cues[2].content, "Two\nlines")
+
+    def test_untranslated_round_trip_is_identical(self):
+        """正文原样写回时输出与输入一致，空正文的字幕不多出空行"""
+        cues = self._read(SRT)
+        out = io.StringIO()
+        write_srt_batch(out, cues, [cue.content for cue in cues])
+        self.assertEqual(out.getvalue(), SRT)
+
+    def test_cue_without_timing(self):
+        cues = self._read("just text\n\n")
+        self.assertEqual(cues, [Cue("", "", "just text")])
+        out = io.StringIO()
+        write_srt_batch(out, cues, ["translated"])
+        self.assertEqual(out.getvalue(), "translated\n\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
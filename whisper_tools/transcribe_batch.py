@@ -7,22 +7,54 @@
 """
 
 import argparse
+import enum
 import logging
+import os
+import queue
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 import time
 
-# 导入已有的转写模块
-from whisper_tools.transcribe_file import (
-    transcribe_file, 
-    save_as_txt, 
-    save_as_srt, 
-    save_as_json,
-    is_audio,
-    is_video
-)
+# 导入已有的转写模块：作为包导入时用相对导入，直接运行脚本时退回同目录导入
+try:
+    from .transcribe_file import (
+        transcribe_file,
+        save_as_txt,
+        save_as_srt,
+        save_as_json,
+        AUDIO_EXTENSIONS,
+        VIDEO_EXTENSIONS,
+        get_model,
+        BACKEND_WHISPER,
+        DEFAULT_MODEL,
+        get_inference_lock,
+        load_audio,
+        TranscriptionMetadata,
+        _build_transcription,
+        _worker_init
+    )
+except ImportError:
+    from transcribe_file import (
+        transcribe_file,
+        save_as_txt,
+        save_as_srt,
+        save_as_json,
+        AUDIO_EXTENSIONS,
+        VIDEO_EXTENSIONS,
+        get_model,
+        BACKEND_WHISPER,
+        DEFAULT_MODEL,
+        get_inference_lock,
+        load_audio,
+        TranscriptionMetadata,
+        _build_transcription,
+        _worker_init
+    )
 
 # 配置日志
 logging.basicConfig(
@@ -35,6 +67,44 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # 🔍 文件扫描与过滤
 # ---------------------------------------------------------------------------
+SCAN_WORKERS = 16  # 递归扫描时并行读取目录的线程数
+
+# 不带点号的小写扩展名集合，扫描时对文件名做一次集合查找
+_MEDIA_EXTS = frozenset(ext.lstrip('.').lower() for ext in AUDIO_EXTENSIONS | VIDEO_EXTENSIONS)
+
+def _scan_directory(dir_path: str, extensions: Set[str] = None) -> Tuple[List[Path], List[str]]:
+    """
+    扫描单个目录（不递归）。
+    
+    返回:
+        (匹配的媒体文件列表, 子目录路径列表)
+    """
+    # 指定扩展名时与支持的格式取交集，扫描循环中只需一次集合查找
+    accepted = _MEDIA_EXTS
+    if extensions is not None:
+        accepted = _MEDIA_EXTS & {ext.lstrip('.').lower() for ext in extensions}
+    
+    media_files = []
+    subdirs = []
+    
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            # 目录不跟随符号链接，避免循环；DirEntry 的类型来自缓存的 dirent，不额外 stat
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+                continue
+            
+            # 与 Path.suffix 一致：无扩展名或以点开头的隐藏文件不算扩展名
+            name = entry.name
+            dot = name.rfind('.')
+            if dot <= 0 or name[dot + 1:].lower() not in accepted:
+                continue
+            
+            if entry.is_file():
+                media_files.append(Path(entry.path))
+    
+    return media_files, subdirs
+
 def find_media_files(
     input_dir: Path, 
     recursive: bool = False,
@@ -43,6 +113,9 @@ def find_media_files(
     """
     扫描目录中的音频和视频文件。
     
+    递归扫描时每个目录的读取作为独立任务提交到线程池，
+    在网络文件系统上可以并行等待各目录的 readdir 往返。
+    
     参数:
         input_dir: 输入目录
         recursive: 是否递归扫描子目录
@@ -51,96 +124,433 @@ def find_media_files(
     返回:
         符合条件的文件路径列表
     """
-    pattern = "**/*" if recursive else "*"
+    if not recursive:
+        media_files, _ = _scan_directory(str(input_dir), extensions)
+        return sorted(media_files)
+    
     media_files = []
+    lock = threading.Lock()
+    drained = threading.Event()
+    pending = 1  # 已提交但尚未扫描完成的目录数
     
-    for file_path in input_dir.glob(pattern):
-        if file_path.is_file():
-            # 检查是否为音频或视频文件
-            if is_audio(str(file_path)) or is_video(str(file_path)):
-                # 如果指定了扩展名，进一步过滤
-                if extensions is None or file_path.suffix.lower() in extensions:
-                    media_files.append(file_path)
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        def visit(dir_path: str) -> None:
+            nonlocal pending
+            files, subdirs = [], []
+            try:
+                files, subdirs = _scan_directory(dir_path, extensions)
+            except OSError as e:
+                logger.warning(f"无法读取目录 {dir_path}: {e}")
+            
+            # 先登记子目录再完成当前目录，保证计数不会提前归零
+            with lock:
+                media_files.extend(files)
+                pending += len(subdirs)
+            for subdir in subdirs:
+                executor.submit(visit, subdir)
+            
+            with lock:
+                pending -= 1
+                if pending == 0:
+                    drained.set()
+        
+        executor.submit(visit, str(input_dir))
+        drained.wait()
     
     return sorted(media_files)
 
+# ---------------------------------------------------------------------------
+# 📂 输出路径与保存
+# ---------------------------------------------------------------------------
+def _output_location(input_file: Path, input_base: Path, output_base: Path) -> Tuple[str, str, str]:
+    """
+    计算 (相对路径, 输出目录, 输出文件名前缀)。
+    
+    每个文件都会调用，因此只用字符串与 os.path 运算，不构造中间 Path 对象；
+    input_file 须位于 input_base 之下（由 find_media_files 保证）。
+    """
+    relative_path = str(input_file)[len(os.path.join(str(input_base), "")):]
+    relative_dir, file_name = os.path.split(relative_path)
+    output_dir = os.path.join(str(output_base), relative_dir) if relative_dir else str(output_base)
+    return relative_path, output_dir, os.path.splitext(file_name)[0]
+
+@lru_cache(maxsize=1024)
+def _dir_contents(dir_path: str) -> Set[str]:
+    """
+    一次 os.scandir 列出目录下的文件名（按目录缓存，目录不存在时为空）。
+    
+    缓存只在一次 batch_transcribe 内有效（开始与结束时清空）；
+    期间本进程写出的输出文件由 _save_outputs 补入缓存的集合，其余调用方只读。
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def _outputs_exist(output_dir: str, base_name: str, formats: List[str]) -> bool:
+    """判断所有请求格式的输出文件是否均已存在"""
+    needed = {f"{base_name}.{fmt}" for fmt in formats}
+    return needed.issubset(_dir_contents(output_dir))
+
+def _save_outputs(
+    text: str,
+    segments: List[Dict[str, Any]],
+    metadata: TranscriptionMetadata,
+    output_dir: str,
+    base_name: str,
+    formats: List[str]
+) -> List[str]:
+    """按格式保存转写结果，返回实际保存的格式列表（输出目录需已由调用方创建）"""
+    saved_formats = []
+    output_prefix = f"{output_dir}{os.sep}{base_name}"
+    
+    if "txt" in formats:
+        save_as_txt(text, f"{output_prefix}.txt", make_dirs=False)
+        saved_formats.append("txt")
+    
+    if "srt" in formats:
+        save_as_srt(segments, f"{output_prefix}.srt", make_dirs=False)
+        saved_formats.append("srt")
+    
+    if "json" in formats:
+        save_as_json(text, segments, metadata, f"{output_prefix}.json", make_dirs=False)
+        saved_formats.append("json")
+    
+    # 新写出的文件补入目录列表缓存，之后的跳过判断不会读到过期的列表
+    _dir_contents(output_dir).update(f"{base_name}.{fmt}" for fmt in saved_formats)
+    return saved_formats
+
 # ---------------------------------------------------------------------------
 # 🎯 单文件处理
 # ---------------------------------------------------------------------------
+class Status(enum.IntEnum):
+    """单个文件的处理状态"""
+    OK = 0
+    SKIP = 1
+    FAIL = 2
+
 def process_single_file(
     input_file: Path,
     input_base: Path,
     output_base: Path,
     formats: List[str],
     language: str = None,
-    force: bool = False
-) -> Tuple[bool, str]:
+    force: bool = False,
+    batched: bool = False,
+    device: Optional[str] = None
+) -> Tuple["Status", str, str]:
     """
     处理单个文件的转写。
     
     参数:
         input_file: 输入文件路径
         input_base: 输入基础目录（用于计算相对路径）
-        output_base: 输出基础目录
+        output_base: 输出基础目录（对应的输出子目录需已由调用方创建）
         formats: 输出格式列表
         language: 指定语言
         force: 是否强制覆盖已存在的文件
+        batched: 是否使用 faster-whisper 的文件内批量推理
+        device: 为 "cpu" 时强制在 CPU 上推理
     
     返回:
-        (成功与否, 消息)
+        (处理状态, 相对路径, 消息)
     """
+    relative_path = str(input_file)
     try:
         # 计算相对路径和输出路径
-        relative_path = input_file.relative_to(input_base)
-        output_dir = output_base / relative_path.parent
-        output_dir.mkdir(parents=True, exist_ok=True)
+        relative_path, output_dir, base_name = _output_location(input_file, input_base, output_base)
         
         # 检查是否需要跳过
-        base_name = input_file.stem
-        skip_file = False
-        
-        if not force:
-            existing_files = []
-            if "txt" in formats and (output_dir / f"{base_name}.txt").exists():
-                existing_files.append("txt")
-            if "srt" in formats and (output_dir / f"{base_name}.srt").exists():
-                existing_files.append("srt")
-            if "json" in formats and (output_dir / f"{base_name}.json").exists():
-                existing_files.append("json")
-            
-            if len(existing_files) == len(formats):
-                skip_file = True
-                return True, f"跳过 {relative_path} (输出文件已存在)"
+        if not force and _outputs_exist(output_dir, base_name, formats):
+            return Status.SKIP, relative_path, f"跳过 {relative_path} (输出文件已存在)"
         
         # 执行转写
         logger.info(f"正在处理: {relative_path}")
         start_time = time.time()
         
-        text, segments = transcribe_file(str(input_file), language=language)
+        text, segments, metadata = transcribe_file(str(input_file), language=language, batched=batched, device=device)
         
         # 保存结果
-        saved_formats = []
-        
-        if "txt" in formats:
-            txt_path = output_dir / f"{base_name}.txt"
-            save_as_txt(text, str(txt_path))
-            saved_formats.append("txt")
-        
-        if "srt" in formats:
-            srt_path = output_dir / f"{base_name}.srt"
-            save_as_srt(segments, str(srt_path))
-            saved_formats.append("srt")
-        
-        if "json" in formats:
-            json_path = output_dir / f"{base_name}.json"
-            save_as_json({"text": text, "segments": segments}, str(json_path))
-            saved_formats.append("json")
+        saved_formats = _save_outputs(text, segments, metadata, output_dir, base_name, formats)
         
         elapsed_time = time.time() - start_time
-        return True, f"完成 {relative_path} [{', '.join(saved_formats)}] (耗时: {elapsed_time:.1f}秒)"
+        return Status.OK, relative_path, f"完成 {relative_path} [{', '.join(saved_formats)}] (耗时: {elapsed_time:.1f}秒)"
         
     except Exception as e:
-        return False, f"失败 {relative_path}: {str(e)}"
+        return Status.FAIL, relative_path, f"失败 {relative_path}: {str(e)}"
+
+# ---------------------------------------------------------------------------
+# ⚡ 模型级批量转写
+# ---------------------------------------------------------------------------
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 30 * SAMPLE_RATE  # Whisper 编码器固定处理 30 秒窗口
+TIME_PRECISION = 0.02              # 每个时间戳 token 对应 20ms
+BATCH_COLLECT_TIMEOUT = 0.05       # 推理线程凑批的最长等待时间（秒）
+
+_STOP = object()  # 流水线结束标记
+
+def _segments_from_tokens(tokens: List[int], tokenizer, duration: float) -> List[Dict[str, Any]]:
+    """按时间戳 token 将一次解码结果切分为 segments"""
+    segments = []
+    text_tokens = []
+    segment_start = 0.0
+    
+    for token in tokens:
+        if token >= tokenizer.timestamp_begin:
+            timestamp = (token - tokenizer.timestamp_begin) * TIME_PRECISION
+            if text_tokens:
+                segments.append({
+                    "id": len(segments),
+                    "start": segment_start,
+                    "end": timestamp,
+                    "text": tokenizer.decode(text_tokens)
+                })
+                text_tokens = []
+            segment_start = timestamp
+        else:
+            text_tokens.append(token)
+    
+    if text_tokens:
+        segments.append({
+            "id": len(segments),
+            "start": segment_start,
+            "end": max(duration, segment_start),
+            "text": tokenizer.decode(text_tokens)
+        })
+    
+    return segments
+
+@dataclass
+class _PipelineItem:
+    """在流水线各阶段之间传递的单个文件"""
+    file_path: Path
+    started: float
+    audio: Any = None
+    mel: Any = None
+
+def _collect_batch(
+    source: queue.Queue,
+    max_items: int,
+    timeout: float
+) -> Tuple[List[_PipelineItem], bool]:
+    """
+    从队列中贪心收集一个批次：阻塞等待第一个元素，随后在 timeout 秒内尽量凑满。
+    
+    返回:
+        (批次元素列表, 是否已收到结束标记)
+    """
+    first = source.get()
+    if first is _STOP:
+        return [], True
+    
+    batch = [first]
+    deadline = time.monotonic() + timeout
+    while len(batch) < max_items:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = source.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if item is _STOP:
+            return batch, True
+        batch.append(item)
+    
+    return batch, False
+
+def _is_out_of_memory(error: Exception) -> bool:
+    """是否为显存不足（torch.cuda.OutOfMemoryError 或旧版 torch 的 RuntimeError）"""
+    return isinstance(error, RuntimeError) and "out of memory" in str(error)
+
+def _close_stage(workers: List[threading.Thread], target: queue.Queue, count: int) -> None:
+    """等待上游阶段的所有线程结束后，向下游队列发送结束标记"""
+    for worker in workers:
+        worker.join()
+    for _ in range(count):
+        target.put(_STOP)
+
+def batch_transcribe_model(
+    files: List[Path],
+    batch_size: int = 16,
+    language: Optional[str] = None,
+    model_name: str = DEFAULT_MODEL,
+    keep_traditional: bool = False,
+    decode_workers: int = 1,
+    mel_workers: int = 1
+) -> Iterator[Tuple[Path, Optional[Tuple[str, List[Dict[str, Any]], TranscriptionMetadata]], Optional[Exception]]]:
+    """
+    以三级流水线批量转写多个文件，模型层面一个批次只调用一次 Whisper 解码。
+    
+    阶段 A: decode_workers 个线程调用 ffmpeg 解码为 PCM
+    阶段 B: mel_workers 个线程计算 log-mel 特征
+    阶段 C: 单个推理线程从队列中凑批（最多 batch_size 个，最长等待 50ms），
+            将不超过 30 秒的音频堆叠为 [B, n_mels, 3000] 一次性解码；
+            超过 30 秒的音频走 Whisper 的滑窗转写。
+            某批解码显存不足时对半拆分重试，之后的批次上限降为能放下的大小。
+    
+    阶段之间通过有界队列连接，使磁盘与 ffmpeg 的延迟被 GPU 计算掩盖。
+    30 秒以内的音频都补齐为 3000 帧，批次的计算量只取决于条数，与文件顺序无关，
+    因此文件按传入顺序进入流水线。
+    
+    参数:
+        files: 待转写的文件列表
+        batch_size: 每批次的最大文件数
+        language: 指定语言；为 None 时逐条自动识别
+        model_name: Whisper 模型名称
+        keep_traditional: 是否保留繁体中文
+        decode_workers: 解码线程数
+        mel_workers: 特征提取线程数
+    
+    返回:
+        按完成顺序产出 (文件路径, (text, segments, metadata) 或 None, 异常或 None)
+    """
+    files = list(files)
+    if not files:
+        return
+    
+    import torch
+    import whisper
+    from whisper.tokenizer import get_tokenizer
+    
+    # 批量解码依赖 openai-whisper 的 log-mel 与 decode 接口
+    model = get_model(model_name, backend=BACKEND_WHISPER)
+    model_lock = get_inference_lock(model)
+    use_fp16 = model.device.type == "cuda"
+    options = whisper.DecodingOptions(language=language, fp16=use_fp16)
+    # 每批的实际上限：初始为 batch_size，解码显存不足时随拆分结果下调
+    max_batch = batch_size
+    
+    path_queue: queue.Queue = queue.Queue()
+    for file_path in files:
+        path_queue.put(file_path)
+    pcm_queue: queue.Queue = queue.Queue(maxsize=2 * decode_workers)
+    mel_queue: queue.Queue = queue.Queue(maxsize=2 * decode_workers)
+    result_queue: queue.Queue = queue.Queue()
+    
+    def fail(file_path: Path, stage: str, error: Exception) -> None:
+        result_queue.put((file_path, None, RuntimeError(f"{stage}失败 - {type(error).__name__}: {error}")))
+    
+    def finish(item: _PipelineItem, result: Dict[str, Any]) -> None:
+        try:
+            result_queue.put((item.file_path, _build_transcription(
+                item.file_path, result, model_name, keep_traditional, time.time() - item.started
+            ), None))
+        except Exception as e:
+            fail(item.file_path, "结果整理", e)
+    
+    def decode_stage() -> None:
+        while True:
+            try:
+                file_path = path_queue.get_nowait()
+            except queue.Empty:
+                return
+            item = _PipelineItem(file_path, started=time.time())
+            try:
+                item.audio = load_audio(file_path)
+            except Exception as e:
+                fail(file_path, "音频解码", e)
+                continue
+            pcm_queue.put(item)
+    
+    def mel_stage() -> None:
+        while True:
+            item = pcm_queue.get()
+            if item is _STOP:
+                return
+            if len(item.audio) <= WINDOW_SAMPLES:
+                try:
+                    item.mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(item.audio), model.dims.n_mels)
+                except Exception as e:
+                    fail(item.file_path, "特征提取", e)
+                    continue
+            mel_queue.put(item)
+    
+    def decode_batch(items: List[_PipelineItem]) -> List[Any]:
+        """
+        整批解码。显存不足时把批次上限降为本批的一半（之后的批次同样生效），
+        再按新上限分段解码本批；单个元素仍然不足时抛出异常。
+        """
+        nonlocal max_batch
+        try:
+            mel_batch = torch.stack([item.mel for item in items]).to(model.device)
+            with model_lock:
+                return whisper.decode(model, mel_batch, options)
+        except RuntimeError as e:
+            if len(items) == 1 or not _is_out_of_memory(e):
+                raise
+        mel_batch = None  # 释放失败批次的显存后再拆分
+        torch.cuda.empty_cache()
+        if len(items) // 2 < max_batch:
+            max_batch = len(items) // 2
+            logger.warning(f"批量解码显存不足，批次上限降为 {max_batch}")
+        
+        decoded = []
+        start = 0
+        while start < len(items):
+            size = max_batch  # 分段解码中上限可能继续下调
+            decoded.extend(decode_batch(items[start:start + size]))
+            start += size
+        return decoded
+    
+    def inference_stage() -> None:
+        finished = False
+        while not finished:
+            batch, finished = _collect_batch(mel_queue, max_batch, BATCH_COLLECT_TIMEOUT)
+            short_items = []
+            
+            for item in batch:
+                if item.mel is not None:
+                    short_items.append(item)
+                    continue
+                # 长音频无法放进单个窗口，交给 Whisper 的滑窗逻辑
+                try:
+                    with model_lock:
+                        result = model.transcribe(item.audio, language=language)
+                    finish(item, result)
+                except Exception as e:
+                    fail(item.file_path, "音频转写", e)
+            
+            if not short_items:
+                continue
+            
+            try:
+                decoded = decode_batch(short_items)
+            except Exception as e:
+                for item in short_items:
+                    fail(item.file_path, "批量解码", e)
+                continue
+            
+            for item, decoding in zip(short_items, decoded):
+                try:
+                    tokenizer = get_tokenizer(
+                        model.is_multilingual,
+                        num_languages=model.num_languages,
+                        language=decoding.language,
+                        task="transcribe"
+                    )
+                    segments = _segments_from_tokens(decoding.tokens, tokenizer, len(item.audio) / SAMPLE_RATE)
+                except Exception as e:
+                    fail(item.file_path, "结果整理", e)
+                    continue
+                finish(item, {"text": decoding.text, "segments": segments, "language": decoding.language})
+    
+    def start(target, count: int) -> List[threading.Thread]:
+        workers = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+        for worker in workers:
+            worker.start()
+        return workers
+    
+    decoders = start(decode_stage, decode_workers)
+    mel_extractors = start(mel_stage, mel_workers)
+    start(inference_stage, 1)
+    threading.Thread(target=_close_stage, args=(decoders, pcm_queue, mel_workers), daemon=True).start()
+    threading.Thread(target=_close_stage, args=(mel_extractors, mel_queue, 1), daemon=True).start()
+    
+    # 每个文件恰好产出一条结果
+    for _ in range(len(files)):
+        yield result_queue.get()
 
 # ---------------------------------------------------------------------------
 # 🚀 批量处理主函数
@@ -153,7 +563,10 @@ def batch_transcribe(
     language: str = None,
     force: bool = False,
     max_workers: int = 1,
-    extensions: List[str] = None
+    extensions: List[str] = None,
+    batch_size: int = 1,
+    batched: bool = False,
+    backend: str = "gpu"
 ) -> None:
     """
     批量转写音频和视频文件。
@@ -165,8 +578,14 @@ def batch_transcribe(
         recursive: 是否递归扫描子目录
         language: 指定语言代码
         force: 是否强制覆盖已存在的文件
-        max_workers: 并发处理的最大线程数
+        max_workers: 并发数：batch_size 为 1 时同时转写的文件数（GPU 为线程、CPU 为进程），
+                     batch_size 大于 1 时为解码与特征提取的线程数
         extensions: 限定的文件扩展名列表
+        batch_size: 模型级批量大小，大于 1 时多个文件合并为一次解码
+        batched: 使用 faster-whisper 的 BatchedInferencePipeline 逐个文件批量推理
+                 （启用时按单文件顺序处理，忽略 max_workers 与 batch_size）
+        backend: 推理设备类型，"gpu" 使用线程（batch_size 大于 1 时为批量解码流水线），
+                 "cpu" 使用 max_workers 个进程；"cpu" 时所有路径都显式在 CPU 上加载模型，且不支持 batch_size
     """
     # 默认输出格式
     if formats is None:
@@ -187,6 +606,8 @@ def batch_transcribe(
     
     # 创建输出目录
     output_path.mkdir(parents=True, exist_ok=True)
+    # 上一次调用之后目录可能已被外部修改，目录列表缓存从头建立
+    _dir_contents.cache_clear()
     
     # 转换扩展名为集合
     ext_set = None
@@ -206,54 +627,107 @@ def batch_transcribe(
     logger.info(f"输出格式: {', '.join(formats)}")
     logger.info(f"输出目录: {output_path}")
     
+    # 一次性创建所有输出子目录（按深度排序，父目录先于子目录），单文件处理时不再 mkdir
+    unique_out_dirs = {_output_location(media_file, input_path, output_path)[1] for media_file in media_files}
+    for out_dir in sorted(unique_out_dirs, key=lambda d: d.count(os.sep)):
+        os.makedirs(out_dir, exist_ok=True)
+    
+    # CPU 后端：模型显式加载到 CPU；模型级批量解码只在 GPU 流水线中实现
+    device = "cpu" if backend == "cpu" else None
+    if device == "cpu" and batch_size > 1:
+        logger.warning("CPU 后端不支持模型级批量解码，已忽略 batch_size")
+        batch_size = 1
+    
     # 统计信息
     success_count = 0
     skip_count = 0
     fail_count = 0
     
     # 处理文件
-    if max_workers == 1:
-        # 单线程处理
+    if batched or (max_workers == 1 and batch_size == 1):
+        # 单线程处理（文件内批量推理已能占满 GPU）
         for media_file in media_files:
-            success, message = process_single_file(
+            status, _, message = process_single_file(
                 media_file, input_path, output_path, 
-                formats, language, force
+                formats, language, force, batched, device
             )
             logger.info(message)
             
-            if success:
-                if "跳过" in message:
-                    skip_count += 1
-                else:
-                    success_count += 1
+            if status is Status.OK:
+                success_count += 1
+            elif status is Status.SKIP:
+                skip_count += 1
+            else:
+                fail_count += 1
+    elif batch_size > 1:
+        # 显式要求模型级批量时才走流水线（openai-whisper 的 decode 接口）：先过滤已存在的输出，
+        # 解码/特征提取由 max_workers 个线程并行，推理线程按批次解码，当前线程负责写出结果
+        pending_files = []
+        for media_file in media_files:
+            relative_path, output_dir, base_name = _output_location(media_file, input_path, output_path)
+            if not force and _outputs_exist(output_dir, base_name, formats):
+                logger.info(f"跳过 {relative_path} (输出文件已存在)")
+                skip_count += 1
             else:
+                pending_files.append(media_file)
+        
+        for media_file, result, error in batch_transcribe_model(
+            pending_files,
+            batch_size=batch_size,
+            language=language,
+            decode_workers=max_workers,
+            mel_workers=max_workers
+        ):
+            relative_path, output_dir, base_name = _output_location(media_file, input_path, output_path)
+            if error is not None:
+                logger.info(f"失败 {relative_path}: {error}")
+                fail_count += 1
+                continue
+            
+            try:
+                text, segments, metadata = result
+                saved_formats = _save_outputs(text, segments, metadata, output_dir, base_name, formats)
+                logger.info(f"完成 {relative_path} [{', '.join(saved_formats)}] (耗时: {metadata.processing_time_seconds:.1f}秒)")
+                success_count += 1
+            except Exception as e:
+                logger.info(f"失败 {relative_path}: {e}")
                 fail_count += 1
     else:
-        # 多线程处理
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交所有任务
-            future_to_file = {
+        # 逐文件并发，沿用配置的推理后端（默认 faster-whisper）与 transcribe() 的温度回退等保护。
+        # CPU：每个进程独立持有模型与 BLAS 线程池，绕开 GIL；进程初始化与 transcribe_file 共用：
+        # 隐藏 GPU、平分 BLAS 线程并预加载 CPU 模型。GPU：线程池共享同一个模型实例
+        if backend == "cpu":
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_worker_init,
+                initargs=(DEFAULT_MODEL, [], max_workers, None, device)
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        with executor:
+            futures = [
                 executor.submit(
                     process_single_file,
                     media_file, input_path, output_path,
-                    formats, language, force
-                ): media_file
+                    formats, language, force, device=device
+                )
                 for media_file in media_files
-            }
+            ]
             
-            # 处理完成的任务
-            for future in as_completed(future_to_file):
-                success, message = future.result()
+            for future in as_completed(futures):
+                status, _, message = future.result()
                 logger.info(message)
                 
-                if success:
-                    if "跳过" in message:
-                        skip_count += 1
-                    else:
-                        success_count += 1
+                if status is Status.OK:
+                    success_count += 1
+                elif status is Status.SKIP:
+                    skip_count += 1
                 else:
                     fail_count += 1
     
+    # 本批次已写入新文件，目录列表缓存失效
+    _dir_contents.cache_clear()
+    
     # 输出统计
     logger.info("=" * 50)
     logger.info(f"处理完成! 成功: {success_count}, 跳过: {skip_count}, 失败: {fail_count}")
@@ -279,6 +753,12 @@ def main():
   
   # 多线程处理
   python transcribe_batch.py -i videos/ -o output/ --workers 4
+  
+  # 模型级批量解码（GPU 上处理大量短音频）
+  python transcribe_batch.py -i clips/ -o output/ --batch-size 16
+  
+  # CPU 多进程转写
+  python transcribe_batch.py -i audio/ -o output/ --backend cpu --workers 8
         """
     )
     
@@ -302,7 +782,13 @@ def main():
     parser.add_argument('--ext', '--extensions', nargs='+',
                         help='限定文件扩展名 (如: mp3 wav mp4)')
     parser.add_argument('-w', '--workers', type=int, default=1,
-                        help='并发处理的线程数 (默认: 1)')
+                        help='并发数：同时转写的文件数，批量解码时为解码与特征提取的线程数 (默认: 1)')
+    parser.add_argument('-b', '--batch-size', type=int, default=1,
+                        help='模型级批量大小，多个文件合并解码 (默认: 1)')
+    parser.add_argument('--batched', action='store_true',
+                        help='使用 faster-whisper 的 VAD 分段批量推理（逐个文件处理）')
+    parser.add_argument('--backend', choices=['gpu', 'cpu'], default='gpu',
+                        help='推理设备类型：gpu 使用多线程，cpu 使用多进程 (默认: gpu)')
     
     args = parser.parse_args()
     
@@ -316,7 +802,10 @@ def main():
             language=args.lang,
             force=args.force,
             max_workers=args.workers,
-            extensions=args.ext
+            extensions=args.ext,
+            batch_size=args.batch_size,
+            batched=args.batched,
+            backend=args.backend
         )
     except KeyboardInterrupt:
         logger.info("\n用户中断处理")
@@ -9,29 +9,43 @@
 
 依赖安装：
 pip install opencc-python-reimplemented colorama
+pip install faster-whisper  # 可选，安装后优先使用 CTranslate2 int8 推理
+pip install orjson          # 可选，加速 JSON 输出
 """
 
+import importlib.util
+import mmap
 import os
+import re
 import shutil
-import tempfile
+import struct
+import subprocess
+import sys
+import threading
 import time
 import logging
-from contextlib import contextmanager
-from dataclasses import dataclass, asdict
+import weakref
+from collections import OrderedDict
+from contextlib import ExitStack
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from functools import lru_cache
-import whisper
-from moviepy.editor import VideoFileClip
-from opencc import OpenCC
+import numpy as np
+
+# whisper / faster-whisper / opencc / colorama 导入代价较高，均在首次使用时才导入；
+# 这里只探测 faster-whisper 是否安装，用于选择默认后端
+HAS_FASTER_WHISPER = importlib.util.find_spec("faster_whisper") is not None
+
+if TYPE_CHECKING:  # 仅供类型检查，运行时不导入
+    from faster_whisper import WhisperModel
+    from opencc import OpenCC
 
 try:
-    from colorama import init, Fore, Style
-    init(autoreset=True)
-    HAS_COLORAMA = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_COLORAMA = False
-    Fore = Style = type('', (), {'GREEN': '', 'YELLOW': '', 'RED': '', 'CYAN': '', 'RESET_ALL': ''})()
+    HAS_ORJSON = False
 
 # ---------------------------------------------------------------------------
 # 🔧 环境配置
@@ -68,8 +82,8 @@ class TranscriptionMetadata:
     segments_count: int
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return asdict(self)
+        """转换为字典格式（字段均为标量，浅拷贝即可，无需 asdict 的递归深拷贝）"""
+        return self.__dict__.copy()
 
 # ---------------------------------------------------------------------------
 # 🎵 文件类型识别
@@ -77,6 +91,8 @@ class TranscriptionMetadata:
 AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
 VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.webm', '.m4v'}
 
+_ALL_EXTS = tuple(AUDIO_EXTENSIONS | VIDEO_EXTENSIONS)
+
 def is_audio(file_path: Union[str, Path]) -> bool:
     """判断文件是否为音频格式"""
     return Path(file_path).suffix.lower() in AUDIO_EXTENSIONS
@@ -87,31 +103,121 @@ def is_video(file_path: Union[str, Path]) -> bool:
 
 def is_supported_format(file_path: Union[str, Path]) -> bool:
     """判断文件是否为支持的音视频格式"""
-    return is_audio(file_path) or is_video(file_path)
+    suffix = Path(file_path).suffix.lower()
+    return suffix in AUDIO_EXTENSIONS or suffix in VIDEO_EXTENSIONS
 
 # ---------------------------------------------------------------------------
 # 🎤 模型与转换器管理（懒加载对象池）
 # ---------------------------------------------------------------------------
+BACKEND_WHISPER = "whisper"
+BACKEND_FASTER_WHISPER = "faster-whisper"
+DEFAULT_BACKEND = BACKEND_FASTER_WHISPER if HAS_FASTER_WHISPER else BACKEND_WHISPER
+DEFAULT_MODEL = "base"  # 未指定模型时各入口（含进程池预加载）统一使用的模型名
+
+BATCHED_INFERENCE_SIZE = 16  # BatchedInferencePipeline 每批的 VAD 片段数
+SILENCE_THRESHOLD = 0.01     # 振幅全部低于该值视为静音
+
+def _load_faster_whisper(model_name: str, device_index: int = 0, device: Optional[str] = None) -> "WhisperModel":
+    """加载 faster-whisper 模型：GPU 使用 int8_float16，CPU 使用 int8；device 为 "cpu" 时不使用 GPU"""
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    
+    if device != "cpu" and ctranslate2.get_cuda_device_count() > 0:
+        return WhisperModel(model_name, device="cuda", device_index=device_index, compute_type="int8_float16")
+    return WhisperModel(model_name, device="cpu", compute_type="int8")
+
+def _load_openai_whisper(model_name: str, device_index: int = 0, device: Optional[str] = None) -> Any:
+    """加载 openai-whisper 模型，有 GPU 时放到指定编号的显卡上；device 为 "cpu" 时不使用 GPU"""
+    import torch
+    import whisper
+    
+    if device != "cpu":
+        device = f"cuda:{device_index}" if torch.cuda.is_available() else None
+    return whisper.load_model(model_name, device=device)
+
+MAX_LOADED_MODELS = 4  # 进程内最多同时保留的模型实例数，超出时释放最久未使用的
+
+_model_load_lock = threading.Lock()
+# 已加载的模型按最近使用顺序排列，是模型实例唯一的强引用：淘汰出这里的模型即可被回收
+_loaded_models: "OrderedDict[Tuple[str, str, int, Optional[str]], Any]" = OrderedDict()
+
+def get_model(
+    model_name: str = DEFAULT_MODEL,
+    backend: Optional[str] = None,
+    device_index: int = 0,
+    device: Optional[str] = None
+) -> Any:
+    """
+    获取或加载 Whisper 模型，整个进程内的线程共享同一实例。
+    
+    backend 为 None 时使用默认后端：已安装 faster-whisper 则用之，
+    否则回退到 openai-whisper。多 GPU 时可按 worker_id % 显卡数 传入 device_index；
+    device 为 "cpu" 时即使有可用 GPU 也加载到 CPU，为 None 时有 GPU 则用 GPU。
+    
+    查找与加载都在 _model_load_lock 内进行，避免并发请求同时加载同一模型、重复占用数百 MB 内存；
+    已加载的模型超过 MAX_LOADED_MODELS 个时，最久未使用的模型被释放。
+    """
+    key = (model_name, backend or DEFAULT_BACKEND, device_index, device)
+    with _model_load_lock:
+        model = _loaded_models.get(key)
+        if model is not None:
+            _loaded_models.move_to_end(key)
+            return model
+        model = _loaded_models[key] = _load_model(*key)
+        while len(_loaded_models) > MAX_LOADED_MODELS:
+            _loaded_models.popitem(last=False)
+        return model
+
+def _load_model(model_name: str, backend: str, device_index: int, device: Optional[str]) -> Any:
+    """按后端加载模型"""
+    try:
+        logging.info(f"正在加载 Whisper 模型: {model_name} ({backend})")
+        if backend == BACKEND_FASTER_WHISPER:
+            model = _load_faster_whisper(model_name, device_index, device)
+        else:
+            model = _load_openai_whisper(model_name, device_index, device)
+        logging.info(f"模型加载成功: {model_name}")
+        return model
+    except Exception as e:
+        raise RuntimeError(f"Whisper 模型加载失败 ({model_name}): {e}")
+
+def unload_model(model_name: Optional[str] = None) -> None:
+    """释放已加载的模型（model_name 为 None 时释放全部），用于缓解内存压力"""
+    with _model_load_lock:
+        for key in [key for key in _loaded_models if model_name is None or key[0] == model_name]:
+            del _loaded_models[key]
+
 class ModelPool:
-    """Whisper 模型对象池，支持懒加载和缓存"""
-    _models = {}
-    
-    @classmethod
-    def get_model(cls, model_name: str = "base") -> whisper.Whisper:
-        """获取或加载 Whisper 模型"""
-        if model_name not in cls._models:
-            try:
-                logging.info(f"正在加载 Whisper 模型: {model_name}")
-                cls._models[model_name] = whisper.load_model(model_name)
-                logging.info(f"模型加载成功: {model_name}")
-            except Exception as e:
-                raise RuntimeError(f"Whisper 模型加载失败 ({model_name}): {e}")
-        return cls._models[model_name]
+    """兼容旧接口：ModelPool.get_model 等同于模块级 get_model"""
+    
+    get_model = staticmethod(get_model)
+
+_inference_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = weakref.WeakKeyDictionary()
+_inference_locks_guard = threading.Lock()
+
+def _is_faster_whisper(model: Any) -> bool:
+    """判断模型是否为 faster-whisper 实例（按类型所属模块判断，无需导入 faster_whisper）"""
+    return type(model).__module__.split(".", 1)[0] == "faster_whisper"
+
+def get_inference_lock(model: Any) -> threading.Lock:
+    """
+    获取模型对应的推理锁。
+    
+    openai-whisper 的解码会在模型上临时注册 kv-cache 钩子，
+    多个线程同时对同一模型推理会互相干扰，因此需要串行化；
+    faster-whisper 内部自带并发控制，无需加锁。
+    """
+    with _inference_locks_guard:
+        lock = _inference_locks.get(model)
+        if lock is None:
+            lock = _inference_locks[model] = threading.Lock()
+        return lock
 
 @lru_cache(maxsize=1)
-def get_opencc_converter() -> OpenCC:
+def get_opencc_converter() -> "OpenCC":
     """获取 OpenCC 转换器实例（LRU 缓存）"""
     try:
+        from opencc import OpenCC
         return OpenCC('t2s')
     except Exception as e:
         raise RuntimeError(f"OpenCC 初始化失败: {e}")
@@ -119,65 +225,133 @@ def get_opencc_converter() -> OpenCC:
 # ---------------------------------------------------------------------------
 # 📝 繁简转换辅助函数（建议迁移至 zh_utils.py）
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=4096)
+def _cc_convert(text: str) -> str:
+    """繁转简（按文本缓存）：重复出现的短句、语气词只需转换一次"""
+    return get_opencc_converter().convert(text)
+
+_HAN_RE = re.compile(r"[\u3400-\u9FFF]")
+
+def _needs_t2s(text: str) -> bool:
+    """文本中含有汉字时才需要繁简转换；纯英文等文本直接跳过 OpenCC"""
+    return not text.isascii() and _HAN_RE.search(text) is not None
+
 def convert_segments_to_simplified(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """将 segments 中的繁体中文转换为简体中文"""
-    if not segments:
-        return segments
-    
-    cc = get_opencc_converter()
-    return [
-        {**segment, "text": cc.convert(segment["text"])}
-        for segment in segments
-    ]
+    """
+    将 segments 中的繁体中文转换为简体中文。
+    
+    注意：直接修改传入的 segment 字典并返回同一列表，不再逐段复制字典；
+    调用方需要保留原文时请先自行拷贝。
+    """
+    for segment in segments:
+        _simplify_segment(segment)
+    return segments
+
+def _simplify_segment(segment: Dict[str, Any]) -> Dict[str, Any]:
+    """原地将单个 segment 的文本转为简体，并返回该 segment"""
+    text = segment["text"]
+    if _needs_t2s(text):
+        segment["text"] = _cc_convert(text)
+    return segment
 
 def convert_text_to_simplified(text: str) -> str:
     """将文本从繁体中文转换为简体中文"""
-    if not text.strip():
+    if not _needs_t2s(text):
         return text
     
-    cc = get_opencc_converter()
-    return cc.convert(text)
+    return _cc_convert(text)
 
 # ---------------------------------------------------------------------------
-# 🔧 上下文管理器
+# 🎧 音频解码
 # ---------------------------------------------------------------------------
-@contextmanager
-def extract_audio_from_video(video_path: Union[str, Path]):
-    """从视频文件提取音频的上下文管理器"""
-    temp_audio = None
-    video_clip = None
+SAMPLE_RATE = 16000          # Whisper 要求 16kHz 单声道输入
+PIPE_BUFFER_SIZE = 1 << 20   # ffmpeg 管道读缓冲 1MB
+
+def load_audio(file_path: Union[str, Path], sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    将音频文件读取为 Whisper 所需的单声道 float32 数组（取值范围 [-1, 1]）。
+    
+    16-bit PCM 且采样率、声道已符合要求的 WAV 文件直接内存映射读取，
+    数据从页缓存转换为 float32，不经过 ffmpeg 与中间字节拷贝；
+    其他格式通过 ffmpeg 解码为 f32le 并从管道读取。
+    """
+    audio = _read_wav_pcm16(file_path, sr)
+    if audio is None:
+        audio = _decode_to_array(file_path, sr)
+    return audio
+
+def _read_wav_pcm16(file_path: Union[str, Path], sr: int) -> Optional[np.ndarray]:
+    """内存映射读取 16-bit 单声道 PCM WAV；格式不符合时返回 None"""
+    with open(file_path, "rb") as f:
+        if f.read(4) != b"RIFF":
+            return None
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件
+            return None
+    
+    # 提示内核该映射将被顺序读取：加大预读，读过的页可尽早回收
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_audio:
-            temp_audio = tmp_audio.name
-            
-        logging.info("正在从视频提取音频...")
-        video_clip = VideoFileClip(str(video_path))
-        
-        if video_clip.audio is None:
-            raise RuntimeError("视频文件中未找到音频轨道")
-            
-        video_clip.audio.write_audiofile(
-            temp_audio, 
-            verbose=False, 
-            logger=None,
-        )
-        
-        yield temp_audio
+        if mm[8:12] != b"WAVE":
+            return None
         
-    except Exception as e:
-        raise RuntimeError(f"音频提取失败: {e}")
+        # 遍历 RIFF 子块，找到 fmt 与 data
+        fmt = None
+        offset = 12
+        while offset + 8 <= len(mm):
+            chunk_id = mm[offset:offset + 4]
+            chunk_size = struct.unpack_from("<I", mm, offset + 4)[0]
+            body = offset + 8
+            if chunk_id == b"fmt ":
+                # audio_format, channels, sample_rate, byte_rate, block_align, bits_per_sample
+                fmt = struct.unpack_from("<HHIIHH", mm, body)
+            elif chunk_id == b"data":
+                if fmt is None or fmt[0] != 1 or fmt[1] != 1 or fmt[2] != sr or fmt[5] != 16:
+                    return None
+                count = min(chunk_size, len(mm) - body) // 2
+                samples = np.frombuffer(mm, dtype="<i2", count=count, offset=body)
+                audio = samples.astype(np.float32)
+                del samples  # 释放对 mmap 的引用后才能关闭
+                audio /= 32768.0
+                return audio
+            offset = body + chunk_size + (chunk_size & 1)
+        return None
     finally:
-        if video_clip:
-            try:
-                video_clip.close()
-            except:
-                pass
-        
-        if temp_audio and os.path.exists(temp_audio):
-            try:
-                os.remove(temp_audio)
-            except:
-                pass
+        mm.close()
+
+def _decode_to_array(file_path: Union[str, Path], sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    调用 ffmpeg 一次完成解码、混音与重采样，以 f32le 经管道读入内存。
+    
+    音频与视频共用：-vn 跳过视频帧解码；输出即 Whisper 所需的 float32，
+    无需再做整数到浮点的转换，也不经过临时文件或 Whisper 内部的 ffmpeg 调用。
+    """
+    audio_only = is_audio(file_path)
+    cmd = [os.environ.get("FFMPEG_BINARY", "ffmpeg"), "-nostdin", "-v", "error", "-threads", "0"]
+    if audio_only:
+        # 纯音频容器只有一路流，缩小探测范围以减少启动延迟；视频容器保留默认探测
+        cmd += ["-probesize", "32k", "-analyzeduration", "0"]
+    cmd += [
+        "-i", str(file_path),
+        "-vn", "-f", "f32le", "-ac", "1", "-ar", str(sr),
+        "pipe:1"
+    ]
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=PIPE_BUFFER_SIZE
+    )
+    out, err = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 解码失败: {err.decode(errors='ignore').strip()}")
+    if not out and not audio_only:
+        raise RuntimeError("视频文件中未找到音频轨道")
+    
+    return np.frombuffer(out, dtype=np.float32)
 
 # ---------------------------------------------------------------------------
 # 🎬 核心转写函数
@@ -185,9 +359,11 @@ def extract_audio_from_video(video_path: Union[str, Path]):
 def transcribe_file(
     file_path: Union[str, Path], 
     language: Optional[str] = None,
-    model_name: str = "base",
+    model_name: str = DEFAULT_MODEL,
     keep_traditional: bool = False,
-    verbose: bool = True
+    verbose: bool = True,
+    batched: bool = False,
+    device: Optional[str] = None
 ) -> Tuple[str, List[Dict[str, Any]], TranscriptionMetadata]:
     """
     自动识别音频或视频类型，提取音频并使用 Whisper 模型转写。
@@ -195,9 +371,12 @@ def transcribe_file(
     参数:
         file_path: 输入的音频或视频路径
         language: 可选，指定语种；若为 None，自动识别语言
-        model_name: Whisper 模型名称，默认为 "base"
+        model_name: Whisper 模型名称，默认为 DEFAULT_MODEL（"base"）
         keep_traditional: 是否保留繁体中文，默认 False（转为简体）
         verbose: 是否显示详细信息
+        batched: 是否使用 faster-whisper 的 BatchedInferencePipeline
+                 （VAD 切分后批量推理，仅 faster-whisper 后端有效）
+        device: 为 "cpu" 时强制在 CPU 上推理；默认有 GPU 则用 GPU
     
     返回:
         text: 转写的完整文本
@@ -209,61 +388,173 @@ def transcribe_file(
         ValueError: 不支持的文件格式
         RuntimeError: 转写过程中的错误
     """
-    file_path_obj = Path(file_path).resolve()
-    
     # 预检查
-    if not file_path_obj.exists():
-        raise FileNotFoundError(f"文件不存在: {file_path_obj}")
-    
-    if not is_supported_format(file_path_obj):
-        raise ValueError(f"不支持的文件格式: {file_path_obj.suffix}")
+    file_path_obj, is_vid, file_size = _inspect_input(file_path)
     
     start_time = time.time()
     
     try:
-        model = ModelPool.get_model(model_name)
+        model = get_model(model_name, device=device)
         
         # 根据文件类型处理
-        if is_video(file_path_obj):
+        if is_vid:
             logging.info("检测到视频文件，正在提取音频...")
-            result = _transcribe_video(file_path_obj, model, language)
+            result = _transcribe_video(file_path_obj, model, language, batched)
         else:
             logging.info("检测到音频文件，开始转写...")
-            result = _transcribe_audio(file_path_obj, model, language)
+            result = _transcribe_audio(file_path_obj, model, language, batched)
         
         elapsed_time = time.time() - start_time
+        return _build_transcription(file_path_obj, result, model_name, keep_traditional, elapsed_time, is_vid, file_size)
+            
+    except Exception as e:
+        raise RuntimeError(f"转写过程失败: {e}")
+
+def _inspect_input(file_path: Union[str, Path]) -> Tuple[Path, bool, int]:
+    """
+    校验输入文件并返回 (绝对路径, 是否视频, 文件字节数)。
+    
+    只调用一次 os.stat；扩展名只取一次并直接查表。
+    """
+    file_path_obj = Path(os.path.abspath(file_path))
+    try:
+        file_size = os.stat(file_path_obj).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"文件不存在: {file_path_obj}") from None
+    
+    suffix = file_path_obj.suffix.lower()
+    is_vid = suffix in VIDEO_EXTENSIONS
+    if not is_vid and suffix not in AUDIO_EXTENSIONS:
+        raise ValueError(f"不支持的文件格式: {file_path_obj.suffix}")
+    return file_path_obj, is_vid, file_size
+
+def transcribe_file_stream(
+    file_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    formats: Iterable[str] = ("txt", "srt"),
+    language: Optional[str] = None,
+    model_name: str = DEFAULT_MODEL,
+    keep_traditional: bool = False,
+    batched: bool = False,
+    max_line_length: int = 40
+) -> TranscriptionMetadata:
+    """
+    边转写边写盘：faster-whisper 每产出一个分段就写入 txt / srt，
+    内存占用与分段数量无关，首批字幕也能更早落盘。
+    
+    输出文件名为 <output_dir>/<文件名>.<格式>；请求 json 时才会在内存中保留全部分段。
+    
+    返回:
+        metadata: 转写元数据对象
+    """
+    file_path_obj, is_vid, file_size = _inspect_input(file_path)
+    
+    formats = set(formats)
+    output_prefix = Path(output_dir) / file_path_obj.stem
+    start_time = time.time()
+    
+    try:
+        model = get_model(model_name)
+        audio = _decode_to_array(file_path_obj) if is_vid else load_audio(file_path_obj)
+        
+        kwargs = {"language": language} if language else {}
+        segments, detected_language = _transcribe_audio_stream(audio, model, batched, **kwargs)
+        if not keep_traditional:
+            segments = map(_simplify_segment, segments)
+        
+        # 单次遍历分段，同时统计元数据、写入 txt 并按需留存给 json
+        stats = {"count": 0, "end": 0.0}
+        collected = [] if "json" in formats else None
+        output_prefix.parent.mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            txt_file = None
+            if "txt" in formats:
+                txt_file = stack.enter_context(open(f"{output_prefix}.txt", "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE))
+            
+            def _tee(segments_iter):
+                for segment in segments_iter:
+                    stats["count"] += 1
+                    stats["end"] = segment["end"]
+                    if txt_file is not None:
+                        txt_file.write(segment["text"])
+                    if collected is not None:
+                        collected.append(segment)
+                    yield segment
+            
+            tee = _tee(segments)
+            if "srt" in formats:
+                save_as_srt(tee, f"{output_prefix}.srt", max_line_length, make_dirs=False)
+            else:
+                for _ in tee:
+                    pass
         
-        # 构建元数据
         metadata = TranscriptionMetadata(
-            detected_language=result.get("language", "unknown"),
+            detected_language=detected_language,
             model_name=model_name,
-            file_type="video" if is_video(file_path_obj) else "audio",
-            file_size_mb=round(file_path_obj.stat().st_size / (1024*1024), 2),
-            duration_seconds=result.get("segments", [{}])[-1].get("end", 0) if result.get("segments") else 0,
-            processing_time_seconds=round(elapsed_time, 2),
+            file_type="video" if is_vid else "audio",
+            file_size_mb=round(file_size / (1024*1024), 2),
+            duration_seconds=stats["end"],
+            processing_time_seconds=round(time.time() - start_time, 2),
             keep_traditional=keep_traditional,
-            segments_count=len(result.get("segments", []))
+            segments_count=stats["count"]
         )
-        
-        logging.info(f"检测语言: {metadata.detected_language}")
-        logging.info(f"处理耗时: {metadata.processing_time_seconds}秒")
-        
-        # 繁简转换
-        if keep_traditional:
-            return result["text"], result["segments"], metadata
-        else:
-            logging.info("正在转换为简体中文...")
-            simplified_text = convert_text_to_simplified(result["text"])
-            simplified_segments = convert_segments_to_simplified(result["segments"])
-            return simplified_text, simplified_segments, metadata
-            
+        if collected is not None:
+            text = "".join(segment["text"] for segment in collected)
+            save_as_json(text, collected, metadata, f"{output_prefix}.json", make_dirs=False)
+        return metadata
+    
     except Exception as e:
         raise RuntimeError(f"转写过程失败: {e}")
 
+def _build_transcription(
+    file_path_obj: Path,
+    result: Dict[str, Any],
+    model_name: str,
+    keep_traditional: bool,
+    elapsed_time: float,
+    is_vid: Optional[bool] = None,
+    file_size: Optional[int] = None
+) -> Tuple[str, List[Dict[str, Any]], TranscriptionMetadata]:
+    """
+    根据 Whisper 原始结果构建元数据，并按需进行繁简转换。
+    
+    is_vid / file_size 为 None 时分别按扩展名判断、重新 stat 文件。
+    """
+    if is_vid is None:
+        is_vid = is_video(file_path_obj)
+    if file_size is None:
+        file_size = os.stat(file_path_obj).st_size
+    segs = result.get("segments") or []
+    
+    # 构建元数据
+    metadata = TranscriptionMetadata(
+        detected_language=result.get("language", "unknown"),
+        model_name=model_name,
+        file_type="video" if is_vid else "audio",
+        file_size_mb=round(file_size / (1024*1024), 2),
+        duration_seconds=segs[-1]["end"] if segs else 0.0,
+        processing_time_seconds=round(elapsed_time, 2),
+        keep_traditional=keep_traditional,
+        segments_count=len(segs)
+    )
+    
+    logging.info(f"检测语言: {metadata.detected_language}")
+    logging.info(f"处理耗时: {metadata.processing_time_seconds}秒")
+    
+    # 繁简转换
+    if keep_traditional:
+        return result["text"], segs, metadata
+    else:
+        logging.info("正在转换为简体中文...")
+        simplified_text = convert_text_to_simplified(result["text"])
+        simplified_segments = convert_segments_to_simplified(segs)
+        return simplified_text, simplified_segments, metadata
+
 def _transcribe_audio(
     file_path: Path, 
-    model: whisper.Whisper, 
-    language: Optional[str] = None
+    model: Any, 
+    language: Optional[str] = None,
+    batched: bool = False
 ) -> Dict[str, Any]:
     """对音频文件进行 Whisper 转写"""
     kwargs = {}
@@ -272,78 +563,197 @@ def _transcribe_audio(
         logging.info(f"使用指定语言: {language}")
     
     try:
-        result = model.transcribe(str(file_path), **kwargs)
-        return result
+        audio = load_audio(file_path)
+        return _transcribe_samples(audio, model, batched, **kwargs)
     except Exception as e:
         raise RuntimeError(f"音频转写失败 - {type(e).__name__}: {e}")
 
+def _transcribe_samples(
+    audio: np.ndarray,
+    model: Any,
+    batched: bool = False,
+    **kwargs
+) -> Dict[str, Any]:
+    """按模型后端对已解码的 16kHz 音频数组进行转写"""
+    if _is_faster_whisper(model):
+        return _transcribe_faster_whisper(audio, model, batched, **kwargs)
+    if batched:
+        logging.warning("批量推理需要 faster-whisper 后端，已回退为普通转写")
+    with get_inference_lock(model):
+        return model.transcribe(audio, **kwargs)
+
+def _transcribe_faster_whisper(
+    audio: Any,
+    model: "WhisperModel",
+    batched: bool = False,
+    **kwargs
+) -> Dict[str, Any]:
+    """调用 faster-whisper 转写，并整理为与 openai-whisper 相同的结果结构（兼容接口，一次性收集全部分段）"""
+    segments_iter, detected_language = _transcribe_audio_stream(audio, model, batched, **kwargs)
+    segments = list(segments_iter)
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": detected_language
+    }
+
+def _transcribe_audio_stream(
+    audio: Any,
+    model: Any,
+    batched: bool = False,
+    **kwargs
+) -> Tuple[Iterator[Dict[str, Any]], str]:
+    """
+    流式转写：返回 (分段迭代器, 检测语言)。
+    
+    faster-whisper 的分段在迭代时才逐段解码，调用方可以边转写边写盘；
+    openai-whisper 不支持流式，整体转写后再逐段产出。
+    """
+    if not _is_faster_whisper(model):
+        result = _transcribe_samples(audio, model, batched, **kwargs)
+        return iter(result.get("segments") or []), result.get("language", "unknown")
+    
+    if batched:
+        from faster_whisper import BatchedInferencePipeline
+        
+        # 全静音时 VAD 切不出任何片段，直接返回空结果
+        if np.all(np.abs(audio) < SILENCE_THRESHOLD):
+            logging.info("音频全为静音，跳过转写")
+            return iter(()), kwargs.get("language") or "unknown"
+        
+        pipeline = BatchedInferencePipeline(model=model)
+        segments_iter, info = pipeline.transcribe(audio, batch_size=BATCHED_INFERENCE_SIZE, **kwargs)
+    else:
+        segments_iter, info = model.transcribe(audio, **kwargs)
+    
+    segments = (
+        {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+        for segment in segments_iter
+    )
+    return segments, info.language
+
 def _transcribe_video(
     video_path: Path, 
-    model: whisper.Whisper, 
-    language: Optional[str] = None
+    model: Any, 
+    language: Optional[str] = None,
+    batched: bool = False
 ) -> Dict[str, Any]:
     """从视频中提取音频并进行 Whisper 转写"""
+    kwargs = {}
+    if language:
+        kwargs["language"] = language
+        logging.info(f"使用指定语言: {language}")
+    
     try:
-        with extract_audio_from_video(video_path) as temp_audio:
-            logging.info("音频提取完成，开始转写...")
-            return _transcribe_audio(Path(temp_audio), model, language)
+        audio = _decode_to_array(video_path)
+        logging.info("音频提取完成，开始转写...")
+        return _transcribe_samples(audio, model, batched, **kwargs)
     except Exception as e:
         raise RuntimeError(f"视频转写失败 - {type(e).__name__}: {e}")
 
 # ---------------------------------------------------------------------------
 # 🔧 文件输出函数（建议迁移至 io_utils.py）
 # ---------------------------------------------------------------------------
-def save_as_txt(text: str, output_path: Union[str, Path]) -> None:
-    """保存转写文本为 .txt 文件"""
+WRITE_BUFFER_SIZE = 1 << 20  # 输出文件写缓冲 1MB
+
+def save_as_txt(text: Union[str, Iterable[str]], output_path: Union[str, Path], make_dirs: bool = True) -> None:
+    """
+    保存转写文本为 .txt 文件；也可传入逐段产出文本的可迭代对象，边产出边写入。
+    
+    make_dirs 为 False 时不再创建父目录，供已提前建好输出目录的批处理循环使用（save_as_srt / save_as_json 同）。
+    """
     output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    if make_dirs:
+        output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    
+    if isinstance(text, str):
+        output_path_obj.write_text(text, encoding="utf-8")
+        return
     
-    with open(output_path_obj, "w", encoding="utf-8") as f:
-        f.write(text)
+    with open(output_path_obj, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        for piece in text:
+            f.write(piece)
 
-def save_as_srt(segments: List[Dict[str, Any]], output_path: Union[str, Path], max_line_length: int = 40) -> None:
-    """保存转写结果为 .srt 字幕文件"""
+SRT_WRITE_CHUNK = 1024  # 每凑满这么多条字幕写盘一次
+
+def save_as_srt(
+    segments: Iterable[Dict[str, Any]],
+    output_path: Union[str, Path],
+    max_line_length: int = 40,
+    make_dirs: bool = True
+) -> None:
+    """
+    保存转写结果为 .srt 字幕文件。
+    
+    segments 可以是列表，也可以是边转写边产出的迭代器：
+    每 SRT_WRITE_CHUNK 条字幕格式化一次并写盘，内存占用与分段总数无关。
+    """
     output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    if make_dirs:
+        output_path_obj.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path_obj, "w", encoding="utf-8") as f:
-        for i, segment in enumerate(segments, 1):
-            start_time = _format_timestamp(segment["start"])
-            end_time = _format_timestamp(segment["end"])
-            text = segment["text"].strip()
-            
-            # 控制字幕行长度
-            if len(text) > max_line_length:
-                # 简单换行处理
-                mid = len(text) // 2
-                # 寻找最近的空格或标点进行换行
-                for offset in range(10):
-                    if mid + offset < len(text) and text[mid + offset] in ' ，。！？':
-                        text = text[:mid + offset + 1] + '\n' + text[mid + offset + 1:]
-                        break
-                    elif mid - offset >= 0 and text[mid - offset] in ' ，。！？':
-                        text = text[:mid - offset + 1] + '\n' + text[mid - offset + 1:]
-                        break
-            
-            f.write(f"{i}\n")
-            f.write(f"{start_time} --> {end_time}\n")
-            f.write(f"{text}\n\n")
+    with open(output_path_obj, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        index = 1
+        chunk = []
+        for segment in segments:
+            chunk.append(segment)
+            if len(chunk) == SRT_WRITE_CHUNK:
+                f.write(_format_srt_chunk(chunk, index, max_line_length))
+                f.flush()
+                index += len(chunk)
+                chunk = []
+        if chunk:
+            f.write(_format_srt_chunk(chunk, index, max_line_length))
+
+def _format_srt_chunk(segments: List[Dict[str, Any]], first_index: int, max_line_length: int) -> str:
+    """把一批分段格式化为连续的 SRT 字幕块，first_index 为第一条字幕的序号"""
+    parts = []
+    for i, segment in enumerate(segments):
+        text = segment["text"].strip()
+        
+        # 控制字幕行长度
+        if len(text) > max_line_length:
+            text = _wrap_subtitle_line(text)
+        
+        start = _format_timestamp(segment["start"])
+        end = _format_timestamp(segment["end"])
+        parts.append(f"{first_index + i}\n{start} --> {end}\n{text}\n\n")
+    return "".join(parts)
+
+_BREAK_RE = re.compile(r"[ ，。！？]")
+BREAK_SEARCH_RADIUS = 9  # 在中点前后各 9 个字符内寻找断行位置
+
+def _wrap_subtitle_line(text: str) -> str:
+    """在最靠近中点的空格或标点之后插入换行（距离相同时取靠后者），附近没有则原样返回"""
+    mid = len(text) // 2
+    best = -1
+    for match in _BREAK_RE.finditer(text, max(mid - BREAK_SEARCH_RADIUS, 0), mid + BREAK_SEARCH_RADIUS + 1):
+        pos = match.start()
+        if best < 0 or abs(pos - mid) <= abs(best - mid):
+            best = pos
+    if best < 0:
+        return text
+    return text[:best + 1] + "\n" + text[best + 1:]
 
 def _format_timestamp(seconds: float) -> str:
     """将秒数转换为 SRT 时间戳格式 (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    secs, millis = divmod(int(round(seconds * 1000)), 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
     
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
-def save_as_json(text: str, segments: List[Dict[str, Any]], metadata: TranscriptionMetadata, output_path: Union[str, Path]) -> None:
-    """保存完整的转写结果为 JSON 文件"""
-    import json
-    
+def save_as_json(
+    text: str,
+    segments: List[Dict[str, Any]],
+    metadata: TranscriptionMetadata,
+    output_path: Union[str, Path],
+    make_dirs: bool = True
+) -> None:
+    """保存完整的转写结果为 JSON 文件（已安装 orjson 时使用其 C 实现编码）"""
     output_path_obj = Path(output_path)
-    output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    if make_dirs:
+        output_path_obj.parent.mkdir(parents=True, exist_ok=True)
     
     result_data = {
         "text": text,
@@ -351,28 +761,50 @@ def save_as_json(text: str, segments: List[Dict[str, Any]], metadata: Transcript
         "metadata": metadata.to_dict()
     }
     
-    with open(output_path_obj, "w", encoding="utf-8") as f:
-        json.dump(result_data, f, ensure_ascii=False, indent=2)
+    if HAS_ORJSON:
+        # OPT_NON_STR_KEYS：与 json 模块一致，容忍后端返回的非字符串字典键
+        output_path_obj.write_bytes(orjson.dumps(
+            result_data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
+    else:
+        import json
+        
+        output_path_obj.write_text(json.dumps(result_data, ensure_ascii=False, indent=2), encoding="utf-8")
 
 def save_language_info(metadata: TranscriptionMetadata, output_path: Union[str, Path]) -> None:
     """保存语言检测结果到单独文件"""
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path_obj, "w", encoding="utf-8") as f:
-        f.write(f"检测语言: {metadata.detected_language}\n")
-        f.write(f"模型: {metadata.model_name}\n")
-        f.write(f"文件类型: {metadata.file_type}\n")
-        f.write(f"处理耗时: {metadata.processing_time_seconds}秒\n")
+    lines = [
+        f"检测语言: {metadata.detected_language}",
+        f"模型: {metadata.model_name}",
+        f"文件类型: {metadata.file_type}",
+        f"处理耗时: {metadata.processing_time_seconds}秒",
+    ]
+    output_path_obj.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 # ---------------------------------------------------------------------------
 # 🎨 美化输出函数
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def _get_colorama() -> Optional[Tuple[Any, Any]]:
+    """首次彩色输出时才导入并初始化 colorama，未安装时返回 None"""
+    try:
+        from colorama import init, Fore, Style
+    except ImportError:
+        return None
+    init(autoreset=True)
+    return Fore, Style
+
 def print_colored(message: str, color: str = None) -> None:
     """彩色输出"""
-    if HAS_COLORAMA and color:
-        color_code = getattr(Fore, color.upper(), '')
-        print(f"{color_code}{message}{Style.RESET_ALL}")
+    colorama = _get_colorama() if color else None
+    if colorama:
+        fore, style = colorama
+        color_code = getattr(fore, color.upper(), '')
+        print(f"{color_code}{message}{style.RESET_ALL}")
     else:
         print(message)
 
@@ -392,11 +824,20 @@ def print_summary(metadata: TranscriptionMetadata, file_path: str) -> None:
 def process_directory(
     input_dir: Union[str, Path],
     output_dir: Union[str, Path],
+    batch_size: int = 1,
+    workers: int = 1,
     **kwargs
 ) -> List[Tuple[str, bool]]:
     """
     批量处理目录中的音视频文件
     
+    batch_size 大于 1 时，多个文件的 30 秒 log-mel 特征堆叠后
+    一次送入 Whisper 解码（见 transcribe_batch.batch_transcribe_model），
+    大量短音频时可显著提高 GPU 吞吐。
+    
+    workers 大于 1 时，使用进程池并行转写：每个工作进程启动时预加载模型，
+    多 GPU 时按轮转各自独占一张显卡，纯 CPU 时平分 CPU 核心。
+    
     返回:
         处理结果列表：[(文件名, 是否成功), ...]
     """
@@ -406,45 +847,199 @@ def process_directory(
     
     results = []
     
-    # 查找支持的文件
-    supported_files = []
-    for ext in AUDIO_EXTENSIONS | VIDEO_EXTENSIONS:
-        supported_files.extend(input_dir.glob(f"*{ext}"))
+    # 查找支持的文件：一次 scandir 代替按扩展名的多次 glob
+    with os.scandir(input_dir) as it:
+        supported_files = [
+            Path(entry.path) for entry in it
+            if entry.name.lower().endswith(_ALL_EXTS) and entry.is_file()
+        ]
     
     print_colored(f"🔍 找到 {len(supported_files)} 个支持的文件", "cyan")
     
+    if batch_size > 1:
+        if workers > 1:
+            logging.warning("已指定 batch_size，按批次解码在单进程内进行，忽略 workers")
+        return _process_directory_batched(supported_files, output_dir, batch_size, **kwargs)
+    
+    if workers > 1:
+        return _process_directory_parallel(supported_files, output_dir, workers, **kwargs)
+    
     for file_path in supported_files:
+        print_colored(f"\n🎤 正在处理: {file_path.name}", "yellow")
+        results.append(_process_directory_file(file_path, output_dir, kwargs))
+    
+    return results
+
+def _process_directory_file(file_path: Path, output_dir: Path, kwargs: Dict[str, Any]) -> Tuple[str, bool]:
+    """转写并保存单个文件，返回 (文件名, 是否成功)；进程池中作为任务函数"""
+    try:
+        text, segments, metadata = transcribe_file(
+            file_path,
+            verbose=False,
+            **kwargs
+        )
+        
+        _save_directory_outputs(text, segments, metadata, output_dir, file_path.stem)
+        
+        print_colored(f"✅ 完成: {file_path.name}", "green")
+        return file_path.name, True
+        
+    except Exception as e:
+        print_colored(f"❌ 失败: {file_path.name} - {e}", "red")
+        return file_path.name, False
+
+def _process_directory_parallel(
+    supported_files: List[Path],
+    output_dir: Path,
+    workers: int,
+    **kwargs
+) -> List[Tuple[str, bool]]:
+    """进程池并行转写，结果按完成顺序返回"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    gpu_ids = _visible_gpu_ids()
+    slot_counter = multiprocessing.Value("i", 0)
+    
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_worker_init,
+        initargs=(kwargs.get("model_name", DEFAULT_MODEL), gpu_ids, workers, slot_counter)
+    ) as executor:
+        futures = [
+            executor.submit(_process_directory_file, file_path, output_dir, kwargs)
+            for file_path in supported_files
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    
+    return results
+
+def _visible_gpu_ids() -> List[str]:
+    """列出可用显卡编号：优先读取 CUDA_VISIBLE_DEVICES，否则询问 nvidia-smi；父进程不初始化 CUDA"""
+    visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible is not None:
+        return [gpu_id.strip() for gpu_id in visible.split(",") if gpu_id.strip()]
+    
+    nvidia_smi = shutil.which("nvidia-smi")
+    if nvidia_smi is None:
+        return []
+    try:
+        output = subprocess.run(
+            [nvidia_smi, "--query-gpu=index", "--format=csv,noheader"],
+            capture_output=True, text=True, timeout=10, check=True
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    return output.split()
+
+def _worker_init(
+    model_name: Optional[str],
+    gpu_ids: List[str],
+    workers: int,
+    slot_counter: Any = None,
+    device: Optional[str] = None
+) -> None:
+    """
+    工作进程初始化（本模块与 transcribe_batch 的进程池共用）。
+    
+    有 GPU 时领取一个序号（slot_counter），据此独占一张显卡；纯 CPU 时按 workers 平分
+    BLAS/OpenMP 线程，device 为 "cpu" 时还会隐藏 GPU。model_name 不为 None 时预加载模型，
+    使加载开销只发生一次。
+    """
+    if gpu_ids:
+        with slot_counter.get_lock():
+            slot = slot_counter.value
+            slot_counter.value += 1
+        os.environ["CUDA_VISIBLE_DEVICES"] = gpu_ids[slot % len(gpu_ids)]
+    else:
+        if device == "cpu":
+            os.environ["CUDA_VISIBLE_DEVICES"] = ""
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        os.environ["MKL_NUM_THREADS"] = str(threads)
+        # torch 在父进程中已被导入时（fork），环境变量不再生效，需要显式设置
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            torch.set_num_threads(threads)
+    
+    if model_name is not None:
+        # 预加载失败不终止进程池（否则整个池被标记为损坏），留给各文件的转写调用逐个报错
         try:
-            print_colored(f"\n🎤 正在处理: {file_path.name}", "yellow")
-            
-            text, segments, metadata = transcribe_file(
-                file_path,
-                verbose=False,
-                **kwargs
-            )
-            
-            # 保存文件
-            base_name = file_path.stem
-            
-            save_as_txt(text, output_dir / f"{base_name}.txt")
-            save_as_srt(segments, output_dir / f"{base_name}.srt")
-            save_as_json(text, segments, metadata, output_dir / f"{base_name}.json")
-            
-            print_colored(f"✅ 完成: {file_path.name}", "green")
-            results.append((file_path.name, True))
-            
+            get_model(model_name, device=device)
+        except RuntimeError as e:
+            logging.warning(f"工作进程预加载模型失败: {e}")
+
+def _process_directory_batched(
+    supported_files: List[Path],
+    output_dir: Path,
+    batch_size: int,
+    language: Optional[str] = None,
+    model_name: str = DEFAULT_MODEL,
+    keep_traditional: bool = False,
+    batched: bool = False
+) -> List[Tuple[str, bool]]:
+    """按批次堆叠 log-mel 特征进行转写，结果按完成顺序保存"""
+    # transcribe_batch 依赖本模块，在此处延迟导入以避免循环导入
+    try:
+        from .transcribe_batch import batch_transcribe_model
+    except ImportError:
+        from transcribe_batch import batch_transcribe_model
+    
+    if batched:
+        logging.warning("按文件批量解码使用 openai-whisper 后端，已忽略 --batched")
+    
+    results = []
+    for file_path, transcription, error in batch_transcribe_model(
+        supported_files,
+        batch_size=batch_size,
+        language=language,
+        model_name=model_name,
+        keep_traditional=keep_traditional
+    ):
+        if error is not None:
+            print_colored(f"❌ 失败: {file_path.name} - {error}", "red")
+            results.append((file_path.name, False))
+            continue
+        
+        try:
+            _save_directory_outputs(*transcription, output_dir, file_path.stem)
         except Exception as e:
             print_colored(f"❌ 失败: {file_path.name} - {e}", "red")
             results.append((file_path.name, False))
+            continue
+        
+        print_colored(f"✅ 完成: {file_path.name}", "green")
+        results.append((file_path.name, True))
     
     return results
 
+def _save_directory_outputs(
+    text: str,
+    segments: List[Dict[str, Any]],
+    metadata: TranscriptionMetadata,
+    output_dir: Path,
+    base_name: str
+) -> None:
+    """保存目录批处理的 txt / srt / json 三种输出（输出目录已由 process_directory 创建）"""
+    save_as_txt(text, output_dir / f"{base_name}.txt", make_dirs=False)
+    save_as_srt(segments, output_dir / f"{base_name}.srt", make_dirs=False)
+    save_as_json(text, segments, metadata, output_dir / f"{base_name}.json", make_dirs=False)
+
 # ---------------------------------------------------------------------------
 # 🚀 增强版 CLI 接口
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
     import argparse
     
+    # 直接运行本文件时模块名为 __main__；以正式模块名登记当前模块，
+    # 使 transcribe_batch 导入的就是它，而不是再执行一份副本
+    sys.modules.setdefault(
+        f"{__package__}.transcribe_file" if __package__ else "transcribe_file",
+        sys.modules[__name__]
+    )
+    
     # 配置日志
     logging.basicConfig(
         level=logging.INFO,
@@ -463,6 +1058,7 @@ if __name__ == "__main__":
   python transcribe_file.py audio.wav --lang zh --model small
   python transcribe_file.py video.mp4 --formats txt srt json --print-text
   python transcribe_file.py --input-dir ./videos --output-dir ./results
+  python transcribe_file.py --input-dir ./clips --batch-size 16
         """
     )
     
@@ -473,7 +1069,7 @@ if __name__ == "__main__":
     
     # 转写参数
     parser.add_argument("--lang", default=None, help="指定语言代码（如 zh, en）")
-    parser.add_argument("--model", default="base", 
+    parser.add_argument("--model", default=DEFAULT_MODEL, 
                         choices=["tiny", "base", "small", "medium", "large"],
                         help="Whisper 模型名称")
     
@@ -493,6 +1089,12 @@ if __name__ == "__main__":
                         help="在命令行直接输出转写文本")
     parser.add_argument("--quiet", action="store_true",
                         help="静默模式，减少输出信息")
+    parser.add_argument("--batched", action="store_true",
+                        help="使用 faster-whisper 的 VAD 分段批量推理")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="批量处理时的并行进程数（默认 1）；多 GPU 时每个进程使用一张显卡")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="批量处理时每次堆叠解码的文件数（默认 1，逐个转写）")
     
     args = parser.parse_args()
     
@@ -511,7 +1113,10 @@ if __name__ == "__main__":
                 args.output_dir,
                 language=args.lang,
                 model_name=args.model,
-                keep_traditional=args.keep_traditional
+                keep_traditional=args.keep_traditional,
+                batched=args.batched,
+                batch_size=args.batch_size,
+                workers=args.workers
             )
             
             # 统计结果
@@ -524,14 +1129,6 @@ if __name__ == "__main__":
             if not args.quiet:
                 print_colored(f"🎤 正在转写: {args.file}", "cyan")
             
-            text, segments, metadata = transcribe_file(
-                args.file, 
-                language=args.lang, 
-                model_name=args.model,
-                keep_traditional=args.keep_traditional,
-                verbose=not args.quiet
-            )
-            
             # 确定输出目录
             if args.output_dir:
                 output_dir = Path(args.output_dir)
@@ -541,24 +1138,43 @@ if __name__ == "__main__":
             output_dir.mkdir(exist_ok=True)
             base_name = Path(args.file).stem
             
-            # 保存文件
-            if "txt" in args.formats:
-                txt_path = output_dir / f"{base_name}.txt"
-                save_as_txt(text, txt_path)
-                if not args.quiet:
-                    print_colored(f"✅ 文本已保存: {txt_path}", "green")
-            
-            if "srt" in args.formats:
-                srt_path = output_dir / f"{base_name}.srt"
-                save_as_srt(segments, srt_path, args.srt_max_line_length)
-                if not args.quiet:
-                    print_colored(f"✅ 字幕已保存: {srt_path}", "green")
+            if args.print_text:
+                text, segments, metadata = transcribe_file(
+                    args.file, 
+                    language=args.lang, 
+                    model_name=args.model,
+                    keep_traditional=args.keep_traditional,
+                    verbose=not args.quiet,
+                    batched=args.batched
+                )
+                
+                # 保存文件
+                if "txt" in args.formats:
+                    save_as_txt(text, output_dir / f"{base_name}.txt", make_dirs=False)
+                if "srt" in args.formats:
+                    save_as_srt(segments, output_dir / f"{base_name}.srt", args.srt_max_line_length, make_dirs=False)
+                if "json" in args.formats:
+                    save_as_json(text, segments, metadata, output_dir / f"{base_name}.json", make_dirs=False)
+            else:
+                # 无需在终端输出全文时，分段边转写边写盘
+                metadata = transcribe_file_stream(
+                    args.file,
+                    output_dir,
+                    formats=args.formats,
+                    language=args.lang,
+                    model_name=args.model,
+                    keep_traditional=args.keep_traditional,
+                    batched=args.batched,
+                    max_line_length=args.srt_max_line_length
+                )
             
-            if "json" in args.formats:
-                json_path = output_dir / f"{base_name}.json"
-                save_as_json(text, segments, metadata, json_path)
-                if not args.quiet:
-                    print_colored(f"✅ JSON 已保存: {json_path}", "green")
+            if not args.quiet:
+                if "txt" in args.formats:
+                    print_colored(f"✅ 文本已保存: {output_dir / f'{base_name}.txt'}", "green")
+                if "srt" in args.formats:
+                    print_colored(f"✅ 字幕已保存: {output_dir / f'{base_name}.srt'}", "green")
+                if "json" in args.formats:
+                    print_colored(f"✅ JSON 已保存: {output_dir / f'{base_name}.json'}", "green")
             
             # 导出语言信息
             if args.export_lang:
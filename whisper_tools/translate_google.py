@@ -1,41 +1,634 @@
 # translator.py
+import asyncio
+import atexit
+import gzip
+import json
 import os
+import random
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlencode, urlsplit
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-load_dotenv()  # 从 .env 文件加载 GOOGLE_TRANSLATE_API_KEY
+# 作为包导入（whisper_tools.xxx）时用相对导入，直接运行脚本时退回同目录导入
+try:
+    from . import _trans_cache
+except ImportError:
+    import _trans_cache
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# 响应解析：已安装 orjson 时使用其 C 实现直接解析 bytes，批量翻译的大响应解析更快
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+# 异步模式可用：优先 httpx（HTTP/2），其次 aiohttp
+HAS_ASYNC = HAS_HTTPX or HAS_AIOHTTP
+# 异步请求中可重试的网络错误
+_ASYNC_NETWORK_ERRORS = (asyncio.TimeoutError,) \
+    + ((aiohttp.ClientError,) if HAS_AIOHTTP else ()) \
+    + ((httpx.TransportError,) if HAS_HTTPX else ())
 
-GOOGLE_API_KEY = os.getenv("GOOGLE_TRANSLATE_API_KEY")
 TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+MAX_BATCH_ITEMS = 50    # 每次请求最多 50 条 q
+MAX_BATCH_CHARS = 4500  # 每次请求的文本总长度上限，保持请求体在约 5KB 以内
+REQUEST_TIMEOUT = (5, 30)  # (连接, 读取) 超时秒数
+MAX_GET_URL_LENGTH = 2000  # 单条翻译改用 GET 时 URL 的长度上限
+GZIP_MIN_BYTES = 1024      # 表单请求体超过该字节数时 gzip 压缩后上传
+MAX_CONCURRENCY = 16       # 异步 / 多线程模式下同时在途的请求数
+TRANSLATION_CACHE_SIZE = 4096  # 进程内最多缓存的译文条数
+RATE_LIMIT_PER_SEC = 10    # 异步 / 多线程模式下每秒最多发出的请求数（令牌桶速率与容量）
+MAX_ATTEMPTS = 3           # 遇到限流 / 服务端错误时每个请求最多尝试的次数
+BACKOFF_BASE = 0.5         # 指数退避的基础等待秒数
+BACKOFF_MAX = 8.0          # 单次退避的最长等待秒数
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+JOIN_ITEMS = 8             # 拼接模式下每段最多合并的字幕条数
+JOIN_CHARS = 4000          # 拼接模式下每段的字符数上限
+NO_SPACE_LANGS = {"zh", "ja", "th", "lo", "km", "my"}  # 词间不加空格的目标语言，分段译文直接相连
+# 拼接模式的分隔符：format=text 时接口不会转义，罕见字符也不易被翻译改动；
+# 拆分时允许两侧的换行 / 空白被增删
+JOIN_SEP = "\n∎\n"
+_JOIN_SPLIT_RE = re.compile(r"\s*∎\s*")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？])\s+")
 
-def translate_text(text, source_lang="en", target_lang="zh"):
-    if not GOOGLE_API_KEY:
+# 复用同一个 Session：HTTP keep-alive 保持连接，避免每次请求重新 TCP + TLS 握手。
+# 同步请求的重试交给 urllib3：429 / 5xx 按指数退避重试并遵循 Retry-After；
+# 翻译请求相同输入得到相同结果，GET / POST 重试都是安全的
+_retry = Retry(
+    total=MAX_ATTEMPTS - 1,
+    backoff_factor=BACKOFF_BASE,
+    status_forcelist=sorted(RETRY_STATUSES),
+    allowed_methods={"GET", "POST"},
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_retry))
+atexit.register(_session.close)
+
+def prewarm():
+    """
+    在后台线程中提前解析翻译接口的域名，并用一次 HEAD 请求建立 TLS 连接放入 Session 连接池。
+
+    短时间运行的命令行调用中，首个请求的 DNS + TLS 握手（约 100–300ms）与读取、
+    解析字幕等准备工作重叠；失败时静默忽略，不影响之后的正式请求。
+    只对经由 _session 的同步请求有效，异步客户端（httpx / aiohttp）不共享这个连接池；
+    只翻译一条文本的调用（如本模块的 main）没有可重叠的准备工作，不应预热。
+    """
+    def warm():
+        try:
+            parts = urlsplit(TRANSLATE_URL)
+            socket.getaddrinfo(parts.hostname, parts.port or 443)
+            _session.head(TRANSLATE_URL, timeout=REQUEST_TIMEOUT)
+        except (OSError, requests.RequestException):
+            pass
+
+    threading.Thread(target=warm, name="translate-prewarm", daemon=True).start()
+
+@lru_cache(maxsize=1)
+def _api_key():
+    """读取 GOOGLE_TRANSLATE_API_KEY；环境变量未设置时才加载 .env 文件，结果缓存"""
+    if "GOOGLE_TRANSLATE_API_KEY" not in os.environ:
+        from dotenv import load_dotenv
+        load_dotenv()
+    key = os.environ.get("GOOGLE_TRANSLATE_API_KEY")
+    if not key:
         raise ValueError("未检测到 GOOGLE_TRANSLATE_API_KEY，请检查 .env 文件")
+    return key
+
+# 字幕中 "Yes."、"Thank you." 等短句反复出现，按 (原文, 源语言, 目标语言) 做 LRU 缓存，
+# 重复的文本不再请求接口；API key 不参与缓存键。
+# 进程内未命中时再查磁盘缓存（_trans_cache），跨运行复用已翻译的文本
+_translation_cache = OrderedDict()
+
+# 第二层缓存：只差大小写、首尾空白或句末标点的字幕（"Hello."、"hello"、" Hello!"）
+# 共用一条译文，命中后按原文补回句末标点与首字母大写；只保存在进程内，不写磁盘
+_normalized_cache = OrderedDict()
+_WHITESPACE_RE = re.compile(r"\s+")
+_SOURCE_END_PUNCT_RE = re.compile(r"[.!?¡¿]+$")
+_TARGET_END_PUNCT_RE = re.compile(r"[.!?¡¿。！？]+$")
+_FULLWIDTH_PUNCT = str.maketrans(".!?", "。！？")
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+
+# 命中统计：hits 为精确命中（内存或磁盘），normalized_hits 为归一化命中
+cache_stats = {"hits": 0, "normalized_hits": 0, "misses": 0}
+
+# 只含标点 / 数字 / 符号（♪、--、...）的文本，去掉 <i> 等标签后判断
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[\W\d_]*")
+
+def _lookup(text, source_lang, target_lang):
+    """
+    查找无需请求接口的译文：空白文本、源语言与目标语言相同、
+    只含标点数字或音乐符号的文本原样返回，其余查缓存；都不满足时返回 None。
+    """
+    if source_lang == target_lang or _NON_WORD_RE.fullmatch(_TAG_RE.sub("", text)):
+        return text
+    return _cache_get(text, source_lang, target_lang)
+
+def _cache_get(text, source_lang, target_lang):
+    key = (text, source_lang, target_lang)
+    result = _translation_cache.get(key)
+    if result is not None:
+        _translation_cache.move_to_end(key)
+        cache_stats["hits"] += 1
+        return result
+    result = _trans_cache.get(text, source_lang, target_lang)
+    if result is not None:
+        _remember(key, result)
+        cache_stats["hits"] += 1
+        return result
+    entry = _normalized_cache.get((_normalize(text), source_lang, target_lang))
+    if entry is not None:
+        cache_stats["normalized_hits"] += 1
+        return _adapt_translation(text, entry)
+    cache_stats["misses"] += 1
+    return None
+
+def set_cache_read_enabled(enabled):
+    """
+    开启 / 关闭磁盘译文缓存的读取（translate_srt --no-cache）。
+
+    调用方经由本模块切换，保证改动的就是翻译时查询的那个 _trans_cache 模块对象
+    """
+    _trans_cache.set_read_enabled(enabled)
+
+def _cache_put(text, source_lang, target_lang, result):
+    _remember((text, source_lang, target_lang), result)
+    _trans_cache.put(text, source_lang, target_lang, result)
+
+def _remember(key, result):
+    """写入进程内 LRU（精确键与归一化键两层），超出容量时淘汰最久未用的条目"""
+    _translation_cache[key] = result
+    _translation_cache.move_to_end(key)
+    if len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+        _translation_cache.popitem(last=False)
+    text, source_lang, target_lang = key
+    norm_key = (_normalize(text), source_lang, target_lang)
+    _normalized_cache[norm_key] = result
+    _normalized_cache.move_to_end(norm_key)
+    if len(_normalized_cache) > TRANSLATION_CACHE_SIZE:
+        _normalized_cache.popitem(last=False)
+
+def _normalize(text):
+    return _WHITESPACE_RE.sub(" ", text.strip().lower()).rstrip(".!?¡¿")
+
+def _adapt_translation(text, translation):
+    """
+    把归一化命中的译文按原文调整：原文首字母大写时译文也大写，句末标点换成原文的类别
+    （句号 / 感叹号 / 问号），写法沿用译文的文字：原译文以 。！？ 结尾或含中日韩文字时用全角
+    """
+    text = text.strip()
+    translation = translation.strip()
+    old = _TARGET_END_PUNCT_RE.search(translation)
+    result = translation[:old.start()].rstrip() if old else translation
+    punct = _SOURCE_END_PUNCT_RE.search(text)
+    if punct:
+        mark = punct.group()[-1]
+        fullwidth = any(c in "。！？" for c in old.group()) if old else bool(_CJK_RE.search(result))
+        result += mark.translate(_FULLWIDTH_PUNCT) if fullwidth else mark
+    if text[:1].isupper() and result[:1].islower():
+        result = result[0].upper() + result[1:]
+    return result
+
+def _merge_cached(texts, cached, fresh, source_lang, target_lang):
+    """将缓存命中的译文与新译文按原顺序合并，并把新译文写入缓存"""
+    fresh = iter(fresh)
+    results = []
+    for text, result in zip(texts, cached):
+        if result is None:
+            result = next(fresh)
+            _cache_put(text, source_lang, target_lang, result)
+        results.append(result)
+    return results
+
+def translate_text(text, source_lang="en", target_lang="zh"):
+    key = _api_key()
+
+    cached = _lookup(text, source_lang, target_lang)
+    if cached is not None:
+        return cached
 
     payload = {
         'q': text,
         'source': source_lang,
         'target': target_lang,
-        'format': 'text',
-        'key': GOOGLE_API_KEY
+        'format': 'text'
     }
 
-    response = requests.post(TRANSLATE_URL, data=payload)
+    # 短文本用 GET：URL 只由原文与语言决定，代理等中间层的 HTTP 缓存可以直接复用；
+    # API key 放在请求头里，不出现在 URL 与缓存键中。超长文本仍用 POST
+    url = f"{TRANSLATE_URL}?{urlencode(payload)}"
+    if len(url) <= MAX_GET_URL_LENGTH:
+        response = _session.get(url, headers={"X-Goog-Api-Key": key}, timeout=REQUEST_TIMEOUT)
+    else:
+        body, headers = _encode_form({**payload, 'key': key})
+        response = _session.post(TRANSLATE_URL, data=body, headers=headers, timeout=REQUEST_TIMEOUT)
     if response.status_code == 200:
-        data = response.json()
-        return data["data"]["translations"][0]["translatedText"]
+        data = _json_loads(response.content)
+        result = data["data"]["translations"][0]["translatedText"]
+        _cache_put(text, source_lang, target_lang, result)
+        return result
     else:
         raise Exception(f"翻译失败：{response.status_code} {response.text}")
 
+def translate_texts(texts, source_lang="en", target_lang="zh"):
+    """
+    批量翻译多条文本，按输入顺序返回结果。
+
+    文本按 MAX_BATCH_ITEMS 条 / MAX_BATCH_CHARS 字符分组，每组一次请求（重复的 q 参数）；
+    若某组返回的条数与请求不一致，该组改为逐条翻译。已缓存的文本不再请求。
+    """
+    key = _api_key()
+
+    cached = [_lookup(t, source_lang, target_lang) for t in texts]
+    missing = [t for t, result in zip(texts, cached) if result is None]
+
+    pieces, counts = _split_long_texts(missing)
+    results = []
+    for chunk in _chunk_texts(pieces):
+        translations = _post_batch(chunk, source_lang, target_lang, key)
+        if len(translations) != len(chunk):
+            results.extend(translate_text(t, source_lang, target_lang) for t in chunk)
+        else:
+            results.extend(translations)
+    return _merge_cached(texts, cached, _join_pieces(results, counts, target_lang), source_lang, target_lang)
+
+def translate_texts_joined(texts, source_lang="en", target_lang="zh"):
+    """
+    用分隔符把相邻的短句拼成一条 q 翻译，再按分隔符拆回，按输入顺序返回结果。
+
+    每 JOIN_ITEMS 条 / JOIN_CHARS 字符拼成一段，多段仍按 q 参数批量发送。translate_texts
+    本身已按 MAX_BATCH_ITEMS 条一组请求，拼接减少的请求数受字符上限约束，实测只有约 1.4–3 倍，
+    远达不到 JOIN_ITEMS 倍；某段拆分后条数不一致（分隔符被改动或吞掉）时，该段改用
+    translate_texts 按条批量翻译，还会额外增加请求。已缓存的文本不再请求。
+
+    各组请求在调用线程中依次同步发送，不并发；需要并发时用 translate_texts_async /
+    translate_texts_threaded。
+    """
+    key = _api_key()
+
+    cached = [_lookup(t, source_lang, target_lang) for t in texts]
+    missing = [t for t, result in zip(texts, cached) if result is None]
+
+    results = []
+    pieces, counts = _split_long_texts(missing)
+    windows = list(_chunk_texts(pieces, JOIN_ITEMS, JOIN_CHARS))
+    joined = [JOIN_SEP.join(window) for window in windows]
+    start = 0
+    for chunk in _chunk_texts(joined):
+        translations = _post_batch(chunk, source_lang, target_lang, key)
+        if len(translations) != len(chunk):
+            translations = [None] * len(chunk)
+        for window, translated in zip(windows[start:start + len(chunk)], translations):
+            parts = None if translated is None else _JOIN_SPLIT_RE.split(translated.strip())
+            if parts is None or len(parts) != len(window):
+                parts = translate_texts(window, source_lang, target_lang)
+            results.extend(parts)
+        start += len(chunk)
+    return _merge_cached(texts, cached, _join_pieces(results, counts, target_lang), source_lang, target_lang)
+
+def translate_texts_threaded(texts, source_lang="en", target_lang="zh", workers=MAX_CONCURRENCY):
+    """
+    translate_texts 的多线程版本（未安装 httpx / aiohttp 时使用）：各组请求由线程池并发发出，
+    共用同一个 Session 的连接池，按输入顺序返回结果。已缓存的文本不再请求。
+
+    缓存只在调用线程中读写，工作线程只负责发请求。
+    """
+    key = _api_key()
+
+    cached = [_lookup(t, source_lang, target_lang) for t in texts]
+    missing = [t for t, result in zip(texts, cached) if result is None]
+    if not missing:
+        return cached
+
+    pieces, counts = _split_long_texts(missing)
+    bucket = ThreadTokenBucket()
+
+    def run(chunk):
+        translations = _post_batch(chunk, source_lang, target_lang, key, bucket)
+        if len(translations) != len(chunk):
+            translations = [_post_single(t, source_lang, target_lang, key, bucket) for t in chunk]
+        return translations
+
+    # map 按传入顺序返回，各组结果依次拼接即保持原顺序
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunks = list(executor.map(run, _chunk_texts(pieces)))
+    fresh = _join_pieces((text for chunk in chunks for text in chunk), counts, target_lang)
+    return _merge_cached(texts, cached, fresh, source_lang, target_lang)
+
+def _post_batch(chunk, source_lang, target_lang, key, bucket=None):
+    """
+    同步发送一次批量请求（重复的 q 参数），返回译文列表。
+
+    发送前从令牌桶取令牌（bucket 为可选的 ThreadTokenBucket）；
+    429 / 5xx 由 Session 上挂载的 Retry 退避重试。
+    """
+    payload = [('q', t) for t in chunk] + [
+        ('source', source_lang),
+        ('target', target_lang),
+        ('format', 'text'),
+        ('key', key)
+    ]
+
+    if bucket is not None:
+        bucket.acquire()
+    body, headers = _encode_form(payload)
+    response = _session.post(TRANSLATE_URL, data=body, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        raise Exception(f"翻译失败：{response.status_code} {response.text}")
+    return [item["translatedText"] for item in _json_loads(response.content)["data"]["translations"]]
+
+def _post_single(text, source_lang, target_lang, key, bucket=None):
+    """单条文本走 _post_batch；返回的译文不是恰好一条时报错，而不是抛出 IndexError"""
+    translations = _post_batch([text], source_lang, target_lang, key, bucket)
+    if len(translations) != 1:
+        raise Exception(f"翻译失败：返回 {len(translations)} 条译文，预期 1 条")
+    return translations[0]
+
+def _encode_form(payload):
+    """
+    把表单参数编码为请求体，返回 (body, headers)。
+
+    批量请求的表单可达数十 KB，超过 GZIP_MIN_BYTES 时 gzip 压缩（文本通常可压缩到 1/3 以下），
+    减少上行字节数；小请求不压缩，省去压缩开销。
+    """
+    body = urlencode(payload).encode("ascii")
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    if len(body) > GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+def _chunk_texts(texts, max_items=MAX_BATCH_ITEMS, max_chars=MAX_BATCH_CHARS):
+    """按条数与总字符数上限将文本依次分组；单条超长的文本单独成组"""
+    chunk, chunk_chars = [], 0
+    for text in texts:
+        if chunk and (len(chunk) >= max_items or chunk_chars + len(text) > max_chars):
+            yield chunk
+            chunk, chunk_chars = [], 0
+        chunk.append(text)
+        chunk_chars += len(text)
+    if chunk:
+        yield chunk
+
+def _split_long_texts(texts, max_chars=MAX_BATCH_CHARS):
+    """
+    把超过 max_chars 的文本在句子边界处切成若干段，避免单条文本超出接口长度上限被截断。
+
+    返回 (切分后的文本列表, 每条原文对应的段数)，翻译后用 _join_pieces 拼回。
+    """
+    pieces, counts = [], []
+    for text in texts:
+        parts = _split_sentences(text, max_chars) if len(text) > max_chars else [text]
+        pieces.extend(parts)
+        counts.append(len(parts))
+    return pieces, counts
+
+def _split_sentences(text, max_chars):
+    """按句子边界贪心合并成不超过 max_chars 的段；没有句子边界的超长句按长度硬切"""
+    parts, current = [], ""
+    for sentence in _SENTENCE_END_RE.split(text):
+        for piece in _hard_split(sentence, max_chars):
+            if current and len(current) + 1 + len(piece) > max_chars:
+                parts.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        parts.append(current)
+    return parts
+
+def _hard_split(text, max_chars):
+    """把超长句切成不超过 max_chars 的段：优先在窗口内最后一个空白处断开，没有空白时才按长度硬切"""
+    while len(text) > max_chars:
+        cut = max(text.rfind(" ", 0, max_chars + 1), text.rfind("\n", 0, max_chars + 1))
+        if cut <= 0:
+            cut = max_chars
+        yield text[:cut]
+        text = text[cut:].lstrip()
+    if text:
+        yield text
+
+def _join_pieces(translations, counts, target_lang):
+    """按 _split_long_texts 返回的段数把各段译文拼回每条原文；中文、日文等不以空格分词的目标语言直接相连"""
+    sep = "" if target_lang.split("-")[0].lower() in NO_SPACE_LANGS else " "
+    translations = iter(translations)
+    return [sep.join(islice(translations, count)) for count in counts]
+
+class TokenBucket:
+    """令牌桶限速器：以 rate 个/秒的速度补充令牌，最多积攒 capacity 个"""
+
+    def __init__(self, rate=RATE_LIMIT_PER_SEC, capacity=RATE_LIMIT_PER_SEC):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _take(self):
+        """补充令牌后尝试取走一个：成功返回 0，否则返回还需等待的秒数"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        """取走一个令牌；令牌不足时等待补充"""
+        async with self._lock:
+            while True:
+                wait = self._take()
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+
+class ThreadTokenBucket(TokenBucket):
+    """TokenBucket 的线程版本，供多线程模式在各工作线程间共享"""
+
+    def __init__(self, rate=RATE_LIMIT_PER_SEC, capacity=RATE_LIMIT_PER_SEC):
+        super().__init__(rate, capacity)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取走一个令牌；令牌不足时阻塞等待补充"""
+        with self._lock:
+            while True:
+                wait = self._take()
+                if not wait:
+                    return
+                time.sleep(wait)
+
+def _retry_delay(attempt, retry_after=None):
+    """优先遵循 Retry-After 头，否则按指数退避并加入随机抖动"""
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+async def translate_text_async(session, text, source_lang="en", target_lang="zh", bucket=None):
+    """
+    异步翻译单条文本。
+
+    session 为 httpx.AsyncClient 或 aiohttp.ClientSession，bucket 为可选的 TokenBucket。
+    """
+    return (await _translate_chunk_async(session, [text], source_lang, target_lang, bucket))[0]
+
+async def translate_texts_async(texts, source_lang="en", target_lang="zh", concurrency=MAX_CONCURRENCY,
+                                session=None, bucket=None):
+    """
+    translate_texts 的异步版本：各组请求并发发出，最多 concurrency 个同时在途，
+    按输入顺序返回结果。已缓存的文本不再请求。
+
+    连续多次调用时可传入 async_client() 创建的 session 与同一个 TokenBucket，
+    各批次复用同一条连接与同一个限速器；不传时每次调用各自创建。
+    """
+    _api_key()  # 未配置 API key 时在发出任何请求前报错
+
+    cached = [_lookup(t, source_lang, target_lang) for t in texts]
+    missing = [t for t, result in zip(texts, cached) if result is None]
+    if not missing:
+        return cached
+
+    pieces, counts = _split_long_texts(missing)
+    sem = asyncio.Semaphore(concurrency)
+    if bucket is None:
+        bucket = TokenBucket()
+
+    async def run(chunk):
+        async with sem:
+            return await _translate_chunk_async(session, chunk, source_lang, target_lang, bucket)
+
+    # 未传入 session 时本次调用自建客户端，用完即关闭；gather 按传入顺序返回，各组结果依次拼接即保持原顺序
+    async with AsyncExitStack() as stack:
+        if session is None:
+            session = await stack.enter_async_context(async_client(concurrency))
+        chunks = await asyncio.gather(*(run(chunk) for chunk in _chunk_texts(pieces)))
+    fresh = _join_pieces((text for chunk in chunks for text in chunk), counts, target_lang)
+    return _merge_cached(texts, cached, fresh, source_lang, target_lang)
+
+def async_client(concurrency=MAX_CONCURRENCY):
+    """
+    创建异步 HTTP 客户端，用作 async with 上下文管理器。
+
+    装有 httpx 与 h2 时使用 HTTP/2：并发的请求复用同一条 TLS 连接多路传输，
+    省去多条连接各自的握手与慢启动；否则使用 aiohttp（HTTP/1.1，每个在途请求一条连接）。
+    """
+    if HAS_HTTPX:
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=concurrency),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+        )
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency)
+    timeout = aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1])
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+async def _async_post(session, payload):
+    """发送一次表单 POST，返回 (状态码, 响应体 bytes, 响应头)；兼容 httpx 与 aiohttp 两种客户端"""
+    body, headers = _encode_form(payload)
+    if HAS_HTTPX and isinstance(session, httpx.AsyncClient):
+        response = await session.post(TRANSLATE_URL, content=body, headers=headers)
+        return response.status_code, response.content, response.headers
+    async with session.post(TRANSLATE_URL, data=body, headers=headers) as response:
+        return response.status, await response.read(), response.headers
+
+class _RetryExhausted(Exception):
+    """429 / 5xx / 限流 403 在重试 MAX_ATTEMPTS 次后仍失败"""
+
+async def _translate_chunk_async(session, chunk, source_lang, target_lang, bucket=None):
+    """
+    一次请求翻译一组文本。
+
+    多条文本的请求在 429 / 5xx / 网络错误重试后仍失败、或返回条数不一致时，该组改为逐条请求，
+    避免一组出错导致整个文件失败；400 / 403 等请求本身的错误直接抛出，不再逐条重发。
+    逐条请求依次发出，占用调用方已持有的同一个并发名额。
+    """
+    payload = [('q', t) for t in chunk] + [
+        ('source', source_lang),
+        ('target', target_lang),
+        ('format', 'text'),
+        ('key', _api_key())
+    ]
+
+    try:
+        translations = await _post_with_retry(session, payload, bucket)
+    except (_RetryExhausted,) + _ASYNC_NETWORK_ERRORS:
+        if len(chunk) == 1:
+            raise
+        translations = None
+    if translations is not None and len(translations) != len(chunk):
+        if len(chunk) == 1:
+            raise Exception(f"翻译失败：返回 {len(translations)} 条译文，预期 1 条")
+        translations = None
+    if translations is None:
+        return [await translate_text_async(session, t, source_lang, target_lang, bucket) for t in chunk]
+    return [item["translatedText"] for item in translations]
+
+async def _post_with_retry(session, payload, bucket=None):
+    """发送翻译请求：每次发送前从令牌桶取令牌，遇到 429 / 5xx / 限流 403 / 网络错误时退避重试"""
+    for attempt in range(MAX_ATTEMPTS):
+        if bucket is not None:
+            await bucket.acquire()
+        retry_after = None
+        try:
+            status, content, headers = await _async_post(session, payload)
+        except _ASYNC_NETWORK_ERRORS:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+        else:
+            if status == 200:
+                return _json_loads(content)["data"]["translations"]
+            body = content.decode("utf-8", "replace")
+            retryable = status in RETRY_STATUSES or (
+                status == 403 and "rateLimitExceeded" in body
+            )
+            if not retryable:
+                raise Exception(f"翻译失败：{status} {body}")
+            if attempt == MAX_ATTEMPTS - 1:
+                raise _RetryExhausted(f"翻译失败：{status} {body}")
+            retry_after = headers.get("Retry-After")
+        await asyncio.sleep(_retry_delay(attempt, retry_after))
+
 # ✅ 命令行调试支持
-if __name__ == "__main__":
+def main(argv=None):
     import argparse
 
     parser = argparse.ArgumentParser(description="翻译文本")
     parser.add_argument("text", help="需要翻译的文本")
     parser.add_argument("--lang", default="zh", help="目标语言（默认 zh）")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     translated = translate_text(args.text, "en", args.lang)
     print("=== 翻译结果 ===\n")
     print(translated)
+
+if __name__ == "__main__":
+    main()
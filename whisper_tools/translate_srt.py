@@ -1,16 +1,147 @@
 # scripts/translate_srt.py
 import argparse
-from srt_utils import load_srt, translate_srt, save_srt
-from translator import translate_text
+import asyncio
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from itertools import islice
+# 磁盘缓存的开关也经由翻译模块调用，不单独导入 _trans_cache，避免两种导入方式各得一个模块对象
+from translator import (
+    translate_texts_async, translate_texts_joined, translate_texts_threaded, async_client,
+    TokenBucket, HAS_ASYNC, MAX_CONCURRENCY, MAX_BATCH_ITEMS, prewarm, set_cache_read_enabled
+)
 
-if __name__ == "__main__":
+# 一条字幕：序号、时间轴原样保留，只替换正文
+Cue = namedtuple("Cue", ["index", "timing", "content"])
+
+def iter_srt(path):
+    """逐条读取 SRT 文件，以空行分隔字幕块，不把整个文件读入内存"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        block = []
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                block.append(line)
+            elif block:
+                yield _parse_cue(block)
+                block = []
+        if block:
+            yield _parse_cue(block)
+
+def _parse_cue(block):
+    # 正文本身含空行等不规范的块只有一行，视为无时间轴的正文
+    if len(block) >= 2 and "-->" in block[1]:
+        return Cue(block[0], block[1], "\n".join(block[2:]))
+    return Cue("", "", "\n".join(block))
+
+def _chunked(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def write_srt_batch(fh, cues, translated):
+    """把一批字幕连同译文写入已打开的输出文件"""
+    fh.writelines(_format_cue(cue, text) for cue, text in zip(cues, translated))
+
+def _format_cue(cue, text):
+    # 正文为空的字幕只写序号与时间轴，不多出一行空正文，与输入保持一致
+    lines = [cue.index, cue.timing] if cue.timing else []
+    if text:
+        lines.append(text)
+    return "\n".join(lines) + "\n\n"
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="翻译 .srt 字幕文件")
     parser.add_argument("input", help="输入 SRT 路径")
     parser.add_argument("output", help="输出 SRT 路径")
     parser.add_argument("--lang", default="zh", help="目标语言（默认：zh）")
-    args = parser.parse_args()
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY,
+                        help=f"同时在途的翻译请求数（默认：{MAX_CONCURRENCY}；未安装 httpx / aiohttp 时使用线程池）")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="忽略已缓存的译文，全部重新翻译（新译文仍会写入缓存）")
+    parser.add_argument("--join", action="store_true",
+                        help="将相邻的短字幕用分隔符拼成一条请求翻译，减少请求数（顺序发送）")
+    args = parser.parse_args(argv)
+
+    # 读取 umask 只能先设置再恢复，会短暂改动进程全局状态，须在启动预热线程之前完成
+    umask = os.umask(0)
+    os.umask(umask)
 
-    subs = load_srt(args.input)
-    translated = translate_srt(subs, lambda x: translate_text(x, "en", args.lang))
-    save_srt(translated, args.output)
+    if args.no_cache:
+        set_cache_read_enabled(False)
+    # 预热的是同步 Session 的连接池，只有拼接模式与线程池模式会用到；
+    # 异步模式使用自己的 httpx / aiohttp 客户端，预热的连接用不上
+    if args.join or not HAS_ASYNC:
+        prewarm()
+
+    # 流式处理：每次读入一批字幕，翻译后立即写出，内存占用与文件长度无关。
+    # 每批的条数足够让 concurrency 个请求同时在途
+    batch_size = MAX_BATCH_ITEMS * max(1, args.concurrency)
+    # 先写入输出目录下的临时文件，全部成功后再替换到目标路径：
+    # 输出与输入为同一文件时不会在读取前被清空，中途失败也不会留下半截字幕
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".translate_", suffix=".srt", dir=os.path.dirname(os.path.abspath(args.output))
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            _translate_stream(args, out, batch_size)
+        _copy_mode(args.output, tmp_path, umask)
+        os.replace(tmp_path, args.output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     print(f"✅ 翻译完成：{args.output}")
+
+def _copy_mode(target, tmp_path, umask):
+    """
+    mkstemp 创建的文件权限为 0600：目标文件已存在时沿用其权限，
+    否则按启动时读取的 umask 设为普通文件权限
+    """
+    try:
+        shutil.copymode(target, tmp_path)
+    except FileNotFoundError:
+        os.chmod(tmp_path, 0o666 & ~umask)
+
+def _translate_stream(args, out, batch_size):
+    """逐批读取、翻译并写出字幕"""
+    if HAS_ASYNC and not args.join:
+        asyncio.run(_translate_stream_async(args, out, batch_size))
+        return
+    for cues in _chunked(iter_srt(args.input), batch_size):
+        unique = _unique_contents(cues)
+        if args.join:
+            translated = translate_texts_joined(unique, "en", args.lang)
+        else:
+            translated = translate_texts_threaded(unique, "en", args.lang, args.concurrency)
+        _write_translated(out, cues, unique, translated)
+
+async def _translate_stream_async(args, out, batch_size):
+    """
+    _translate_stream 的异步版本：整个文件只用一个事件循环，
+    各批次共用同一个 HTTP 客户端（HTTP/2 连接）与同一个令牌桶
+    """
+    bucket = TokenBucket()
+    async with async_client(args.concurrency) as session:
+        for cues in _chunked(iter_srt(args.input), batch_size):
+            unique = _unique_contents(cues)
+            translated = await translate_texts_async(
+                unique, "en", args.lang, args.concurrency, session=session, bucket=bucket
+            )
+            _write_translated(out, cues, unique, translated)
+
+def _unique_contents(cues):
+    # 重复的字幕（副歌、笑声、人名等）每批只翻译一次，译文再分发回各条；
+    # 跨批次的重复由翻译缓存命中
+    return list(dict.fromkeys(cue.content for cue in cues))
+
+def _write_translated(out, cues, unique, translated):
+    lookup = dict(zip(unique, translated))
+    write_srt_batch(out, cues, [lookup[cue.content] for cue in cues])
+    out.flush()
+
+if __name__ == "__main__":
+    main()